@@ -1,11 +1,21 @@
+import orjson
+
 from dagster_dbt import dbt_assets, DbtCliResource
 from dagster import AssetExecutionContext
 from .dbt_translator import MultiProjectDbtTranslator
 
+MANIFEST_PATH = "/opt/dagster/app/dbt_project/dbt/target/manifest.json"
+
+# Parse the manifest once and share it (and the translator) between both asset sets
+with open(MANIFEST_PATH, "rb") as f:
+    _MANIFEST = orjson.loads(f.read())
+
+_TRANSLATOR = MultiProjectDbtTranslator()
+
 
 @dbt_assets(
-    manifest="/opt/dagster/app/dbt_project/dbt/target/manifest.json",
-    dagster_dbt_translator=MultiProjectDbtTranslator(),
+    manifest=_MANIFEST,
+    dagster_dbt_translator=_TRANSLATOR,
     select="resource_type:snapshot",
 )
 def dbt_snapshots(context: AssetExecutionContext, dbt: DbtCliResource):
@@ -15,8 +25,8 @@ def dbt_snapshots(context: AssetExecutionContext, dbt: DbtCliResource):
 
 
 @dbt_assets(
-    manifest="/opt/dagster/app/dbt_project/dbt/target/manifest.json",
-    dagster_dbt_translator=MultiProjectDbtTranslator(),
+    manifest=_MANIFEST,
+    dagster_dbt_translator=_TRANSLATOR,
     select="resource_type:model",
 )
 def dbt_models(context: AssetExecutionContext, dbt: DbtCliResource):
@@ -1,5 +1,23 @@
-from dagster_dbt import DagsterDbtTranslator
+from functools import cache
+
 from dagster import AssetKey
+from dagster_dbt import DagsterDbtTranslator
+
+
+@cache
+def _clean_project(project_name: str) -> str:
+    return project_name.replace("_dbt", "")
+
+
+@cache
+def _asset_key_for(resource_type: str, name: str, fqn: tuple[str, ...]) -> AssetKey:
+    project_name = _clean_project(fqn[0])
+    layer = fqn[1] if len(fqn) >= 2 else "default"
+
+    if resource_type == "source":
+        return AssetKey([project_name, layer, f"raw_{name}"])
+
+    return AssetKey([project_name, layer, name])
 
 
 class MultiProjectDbtTranslator(DagsterDbtTranslator):
@@ -7,21 +25,13 @@ class MultiProjectDbtTranslator(DagsterDbtTranslator):
         fqn = dbt_resource_props["fqn"]
 
         if len(fqn) >= 1:
-            project_name = fqn[0]
-            clean_project = project_name.replace("_dbt", "")
-            return clean_project
+            return _clean_project(fqn[0])
 
         return "default"
 
     def get_asset_key(self, dbt_resource_props):
-        resource_type = dbt_resource_props["resource_type"]
-        name = dbt_resource_props["name"]
-        fqn = dbt_resource_props["fqn"]
-
-        project_name = fqn[0].replace("_dbt", "")
-        layer = fqn[1] if len(fqn) >= 2 else "default"
-
-        if resource_type == "source":
-            return AssetKey([project_name, layer, f"raw_{name}"])
-
-        return AssetKey([project_name, layer, name])
+        return _asset_key_for(
+            dbt_resource_props["resource_type"],
+            dbt_resource_props["name"],
+            tuple(dbt_resource_props["fqn"]),
+        )
@@ -1,4 +1,24 @@
-from dagster import asset, AssetExecutionContext, Output
+import posixpath
+from datetime import UTC, datetime
+from typing import Any
+
+import pyarrow as pa
+import pymongo
+from dagster import (
+    asset,
+    graph_asset,
+    op,
+    AssetExecutionContext,
+    Config,
+    DailyPartitionsDefinition,
+    DynamicOut,
+    DynamicOutput,
+    OpExecutionContext,
+    Output,
+    ResourceParam,
+    TimeWindow,
+)
+from psycopg2.pool import AbstractConnectionPool
 from ..clickhouse_load_tool.mongo_loader import MongoToClickhouseLoader
 from ..clickhouse_load_tool.postgres_loader import PostgresToClickhouseLoader
 from ..resources.config import (
@@ -8,47 +28,168 @@ from ..resources.config import (
     MINIO_CONFIG,
 )
 
+MongoClient = ResourceParam[pymongo.MongoClient]
+PostgresPool = ResourceParam[AbstractConnectionPool]
+ClickHouseClient = ResourceParam[Any]
+S3Client = ResourceParam[Any]
 
-@asset(
-    group_name="extract_load",
-    description="Extract users from MongoDB (snapshot) and load to ClickHouse",
+NUM_USER_SHARDS = 16
+
+
+# One partition per UTC day of updated_at; end_offset=1 exposes the current day
+# so the hourly schedule can keep refreshing it
+SAVINGS_TRANSACTIONS_PARTITIONS = DailyPartitionsDefinition(
+    start_date="2023-01-01", end_offset=1
 )
-def raw_users(context: AssetExecutionContext) -> Output:
-    context.log.info("Initializing MongoDB users pipeline...")
 
-    loader = MongoToClickhouseLoader(
+
+class ExtractLoadConfig(Config):
+    # Extract batches are sized to roughly this many bytes of Arrow data
+    target_batch_bytes: int = 64 * 1024 * 1024
+
+
+USERS_ARROW_SCHEMA = {
+    "_id": pa.string(),
+    "firstName": pa.string(),
+    "lastName": pa.string(),
+    "occupation": pa.string(),
+    "state": pa.string(),
+}
+
+
+def _users_loader(
+    mongo: pymongo.MongoClient | None = None,
+    clickhouse: Any = None,
+    s3: Any = None,
+    target_batch_bytes: int | None = None,
+) -> MongoToClickhouseLoader:
+    return MongoToClickhouseLoader(
         **MONGO_CONFIG,
         **CLICKHOUSE_CONFIG,
         **MINIO_CONFIG,
         tracking_column="_id",
         upsert_key="_Uid",
         batch_size=10000,
+        staging_format="parquet",
+        target_batch_bytes=target_batch_bytes,
+        mongo_client=mongo,
+        clickhouse_client=clickhouse,
+        s3_client=s3,
     )
 
-    context.log.info("Loader initialized. Starting extraction...")
 
-    context.log.info("Extracting users from MongoDB to S3...")
+def _postgres_loader(
+    postgres: AbstractConnectionPool,
+    clickhouse: Any,
+    s3: Any,
+    upsert_key: str,
+    target_batch_bytes: int,
+) -> PostgresToClickhouseLoader:
+    return PostgresToClickhouseLoader(
+        **POSTGRES_CONFIG,
+        **CLICKHOUSE_CONFIG,
+        **MINIO_CONFIG,
+        tracking_column="updated_at",
+        upsert_key=upsert_key,
+        batch_size=10000,
+        staging_format="parquet",
+        target_batch_bytes=target_batch_bytes,
+        postgres_pool=postgres,
+        clickhouse_client=clickhouse,
+        s3_client=s3,
+    )
+
+
+@op(out=DynamicOut(dict))
+def plan_user_shards(context: OpExecutionContext, mongo: MongoClient):
+    context.log.info("Initializing MongoDB users pipeline...")
+
+    loader = _users_loader(mongo=mongo)
+    try:
+        bounds = loader.get_id_shard_bounds("users", NUM_USER_SHARDS)
+    finally:
+        loader.close_connections()
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    prefix = f"full/users_to_raw_users_{timestamp}"
+    context.log.info("Splitting users into %d _id shards under %s", len(bounds), prefix)
+
+    for i, (lo, hi) in enumerate(bounds):
+        yield DynamicOutput(
+            {
+                "lo": lo,
+                "hi": hi,
+                "s3_key": f"{prefix}/shard_{i:02d}.{loader.file_extension}",
+            },
+            mapping_key=f"shard_{i:02d}",
+        )
+
+
+@op(tags={"dagster/concurrency_key": "extract_load"})
+def extract_user_shard(
+    context: OpExecutionContext,
+    config: ExtractLoadConfig,
+    mongo: MongoClient,
+    clickhouse: ClickHouseClient,
+    s3: S3Client,
+    shard: dict,
+) -> str | None:
+    context.log.info(
+        "Extracting users with _id in [%s, %s) to S3...", shard["lo"], shard["hi"]
+    )
+
+    loader = _users_loader(
+        mongo, clickhouse, s3, target_batch_bytes=config.target_batch_bytes
+    )
     s3_key = loader.extract_to_s3(
-        source_table="users", target_table="raw_users", load_type="full"
+        source_table="users",
+        target_table="raw_users",
+        load_type="full",
+        output_s3_key=shard["s3_key"],
+        id_range=(shard["lo"], shard["hi"]),
+        arrow_schema=USERS_ARROW_SCHEMA,
     )
-    context.log.info(f"Extracted to S3: {s3_key}")
+    context.log.info("Extracted to S3: %s", s3_key)
+
+    return s3_key
+
+
+@op
+def load_user_shards(
+    context: OpExecutionContext,
+    clickhouse: ClickHouseClient,
+    s3: S3Client,
+    s3_keys: list[str],
+) -> Output:
+    loader = _users_loader(clickhouse=clickhouse, s3=s3)
 
-    context.log.info("Loading users from S3 to ClickHouse...")
+    # Shards whose _id range held no documents are not staged
+    s3_keys = [s3_key for s3_key in s3_keys if s3_key]
+    s3_glob = (
+        f"{posixpath.dirname(s3_keys[0])}/*.{loader.file_extension}"
+        if s3_keys
+        else None
+    )
+
+    context.log.info("Loading %d user shards from S3 to ClickHouse...", len(s3_keys))
     rows_loaded = loader.load_to_clickhouse(
-        file_key=s3_key,
+        file_key=s3_glob,
         target_table="raw_users",
         source="s3",
         load_type="full",
     )
 
-    context.log.info(f"Loaded {rows_loaded:,} rows to ClickHouse")
-    context.log.info("MongoDB users pipeline completed successfully!")
+    context.log.info(
+        "Loaded %d rows to ClickHouse. MongoDB users pipeline completed successfully!",
+        rows_loaded,
+    )
 
     return Output(
         value=rows_loaded,
         metadata={
             "rows_loaded": rows_loaded,
-            "s3_key": s3_key,
+            "s3_key": s3_glob,
+            "shards": len(s3_keys),
             "load_type": "full",
             "source": "MongoDB",
             "table": "raw_users",
@@ -56,104 +197,157 @@ def raw_users(context: AssetExecutionContext) -> Output:
     )
 
 
-@asset(
+@graph_asset(
     group_name="extract_load",
-    description="Extract plans from PostgreSQL (incremental) and load to ClickHouse",
+    description="Extract users from MongoDB (snapshot, sharded by _id) and load to ClickHouse",
 )
-def raw_plans(context: AssetExecutionContext) -> Output:
-    context.log.info("Initializing PostgreSQL plans pipeline...")
+def raw_users():
+    s3_keys = plan_user_shards().map(extract_user_shard).collect()
+    return load_user_shards(s3_keys)
 
-    loader = PostgresToClickhouseLoader(
-        **POSTGRES_CONFIG,
-        **CLICKHOUSE_CONFIG,
-        **MINIO_CONFIG,
-        tracking_column="updated_at",
-        upsert_key="plan_id",
-        batch_size=10000,
-    )
 
-    context.log.info("Loader initialized. Starting extraction (incremental mode)...")
+def _in_window(value: Any, window: TimeWindow) -> bool:
+    if not isinstance(value, datetime):
+        return False
+    start, end = window.start, window.end
+    if value.tzinfo is None:
+        # ClickHouse hands DateTime columns back as naive UTC
+        start = start.astimezone(UTC).replace(tzinfo=None)
+        end = end.astimezone(UTC).replace(tzinfo=None)
+    return start <= value < end
 
-    context.log.info("Extracting plans from PostgreSQL to S3...")
-    s3_key = loader.extract_to_s3(
-        source_table="savings_plan",
-        target_table="raw_plans",
+
+def _load_postgres_incremental(
+    context: AssetExecutionContext,
+    loader: PostgresToClickhouseLoader,
+    source_table: str,
+    target_table: str,
+    last_value: Any = None,
+    tracking_range: tuple[Any, Any] | None = None,
+) -> int:
+    # Only a first load with no watermark reads the whole table; that goes
+    # through S3 in parallel parts, while deltas and single partitions stream
+    # straight to ClickHouse
+    load = loader.extract_and_load_direct
+    if last_value is None and tracking_range is None:
+        context.log.info(
+            "Staging %s through S3 while loading ClickHouse...", source_table
+        )
+        load = loader.extract_and_load_pipelined
+    else:
+        context.log.info("Streaming %s directly to ClickHouse...", source_table)
+
+    return load(
+        source_table=source_table,
+        target_table=target_table,
         source_schema="public",
         load_type="incremental",
-    )
-    context.log.info(f"Extracted to S3: {s3_key}")
-
-    context.log.info("Loading plans from S3 to ClickHouse...")
-    rows_loaded = loader.load_to_clickhouse(
-        file_key=s3_key, target_table="raw_plans", source="s3", load_type="incremental"
+        tracking_range=tracking_range,
+        last_value=last_value,
     )
 
-    context.log.info(f"Loaded {rows_loaded:,} rows to ClickHouse")
-    context.log.info("PostgreSQL plans pipeline completed successfully!")
 
-    return Output(
-        value=rows_loaded,
-        metadata={
-            "rows_loaded": rows_loaded,
-            "s3_key": s3_key,
+def _build_postgres_extract_asset(
+    name: str,
+    source_table: str,
+    upsert_key: str,
+    label: str,
+    description: str,
+    priority: int,
+    partitions_def: DailyPartitionsDefinition | None = None,
+):
+    @asset(
+        name=name,
+        group_name="extract_load",
+        description=description,
+        partitions_def=partitions_def,
+        op_tags={
+            "dagster/concurrency_key": "extract_load",
+            "dagster/priority": str(priority),
+        },
+    )
+    def _extract_asset(
+        context: AssetExecutionContext,
+        config: ExtractLoadConfig,
+        postgres: PostgresPool,
+        clickhouse: ClickHouseClient,
+        s3: S3Client,
+    ) -> Output:
+        loader = _postgres_loader(
+            postgres, clickhouse, s3, upsert_key, config.target_batch_bytes
+        )
+        metadata = {
             "load_type": "incremental",
             "source": "PostgreSQL",
-            "table": "raw_plans",
+            "table": name,
             "tracking_column": "updated_at",
-        },
-    )
+        }
 
+        # Partitioned assets load one updated_at window; rows are upserted on
+        # the upsert key, so re-running a partition is idempotent
+        tracking_range = window = None
+        if context.has_partition_key:
+            window = context.partition_time_window
+            tracking_range = (window.start.date(), window.end.date())
+            metadata["partition"] = context.partition_key
+            context.log.info(
+                "Starting PostgreSQL %s pipeline for partition %s...",
+                label,
+                context.partition_key,
+            )
+        else:
+            context.log.info(
+                "Starting PostgreSQL %s pipeline (incremental mode)...", label
+            )
 
-@asset(
-    group_name="extract_load",
-    description="Extract transactions from PostgreSQL (incremental) and load to ClickHouse",
-)
-def raw_savings_transactions(context: AssetExecutionContext) -> Output:
-    context.log.info("Initializing PostgreSQL transactions pipeline...")
+        # A partition the watermark already falls in (the open day the hourly
+        # schedule keeps refreshing) only reads rows past it; older partitions
+        # are re-read whole
+        last_value = loader.get_last_loaded_value(name)
+        if window is not None and not _in_window(last_value, window):
+            last_value = None
+        if last_value is not None or window is None:
+            context.log.info("Last loaded value: %s", last_value)
+            metadata["last_value"] = str(last_value)
 
-    loader = PostgresToClickhouseLoader(
-        **POSTGRES_CONFIG,
-        **CLICKHOUSE_CONFIG,
-        **MINIO_CONFIG,
-        tracking_column="updated_at",
-        upsert_key="txn_id",
-        batch_size=10000,
-    )
+        rows_loaded = _load_postgres_incremental(
+            context,
+            loader,
+            source_table,
+            name,
+            last_value=last_value,
+            tracking_range=tracking_range,
+        )
 
-    context.log.info("Loader initialized. Starting extraction (incremental mode)...")
+        context.log.info(
+            "Loaded %d rows to ClickHouse. "
+            "PostgreSQL %s pipeline completed successfully!",
+            rows_loaded,
+            label,
+        )
 
-    last_value = loader.get_last_loaded_value("raw_savings_transactions")
-    context.log.info(f"Last loaded value: {last_value}")
+        return Output(
+            value=rows_loaded, metadata={"rows_loaded": rows_loaded, **metadata}
+        )
 
-    context.log.info("Extracting transactions from PostgreSQL to S3...")
-    s3_key = loader.extract_to_s3(
-        source_table="savingsTransaction",
-        target_table="raw_savings_transactions",
-        source_schema="public",
-        load_type="incremental",
-    )
-    context.log.info(f"Extracted to S3: {s3_key}")
+    return _extract_asset
 
-    context.log.info("Loading transactions from S3 to ClickHouse...")
-    rows_loaded = loader.load_to_clickhouse(
-        file_key=s3_key,
-        target_table="raw_savings_transactions",
-        source="s3",
-        load_type="incremental",
-    )
 
-    context.log.info(f"Loaded {rows_loaded:,} rows to ClickHouse")
-    context.log.info("PostgreSQL transactions pipeline completed successfully!")
+raw_plans = _build_postgres_extract_asset(
+    name="raw_plans",
+    source_table="savings_plan",
+    upsert_key="plan_id",
+    label="plans",
+    description="Extract plans from PostgreSQL (incremental) and load to ClickHouse",
+    priority=1,
+)
 
-    return Output(
-        value=rows_loaded,
-        metadata={
-            "rows_loaded": rows_loaded,
-            "s3_key": s3_key,
-            "load_type": "incremental",
-            "source": "PostgreSQL",
-            "table": "raw_savings_transactions",
-            "tracking_column": "updated_at",
-            "last_value": str(last_value),
-        },
-    )
+raw_savings_transactions = _build_postgres_extract_asset(
+    name="raw_savings_transactions",
+    source_table="savingsTransaction",
+    upsert_key="txn_id",
+    label="transactions",
+    description="Extract transactions from PostgreSQL (one updated_at day per partition) and load to ClickHouse",
+    priority=2,
+    partitions_def=SAVINGS_TRANSACTIONS_PARTITIONS,
+)
@@ -1,19 +1,336 @@
-import os
+import gzip
+import io
 import uuid
+import itertools
+import queue
+import threading
+import fnmatch
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
 import re
-import json
+import orjson
+import psutil
 import boto3
+from boto3.s3.transfer import TransferConfig
 import clickhouse_connect
-import tempfile
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
+# staging format -> (ClickHouse input format, file extension)
+# ClickHouse picks up the gzip compression of text formats from the extension
+STAGING_FORMATS = {
+    "json": ("JSONEachRow", "json.gz"),
+    "parquet": ("Parquet", "parquet"),
+    # Written by sources that can export CSV natively (PostgreSQL COPY)
+    "csv": ("CSVWithNames", "csv.gz"),
+}
+
+# Text staging trades ratio for speed; JSON and CSV compress well even at
+# level 1. Small per-record writes are buffered before reaching the compressor.
+STAGING_GZIP_LEVEL = 1
+GZIP_WRITE_BUFFER_BYTES = 1024 * 1024
+
+PARQUET_ROW_GROUP_SIZE = 1_000_000
+# zstd gives markedly smaller staged files than snappy, and ClickHouse decodes
+# it at close to the same speed
+PARQUET_COMPRESSION = "zstd"
+
+# Staging and temp tables write parts to disk rather than holding a whole
+# delta (a backfill or a large day) in server memory
+STAGING_ENGINE = "MergeTree() ORDER BY tuple()"
+
+# Staged files matched by a glob are inserted by this many concurrent INSERTs
+MAX_PARALLEL_INSERTS = 8
+
+# Let ClickHouse fetch and parse staged S3 objects with many parallel readers
+S3_READ_SETTINGS = {
+    "max_download_threads": 16,
+    "s3_max_connections": 32,
+    "input_format_parallel_parsing": 1,
+    "max_threads": 16,
+    # CSV exports carry ISO timestamps with a UTC offset
+    "date_time_input_format": "best_effort",
+}
+
+# Pipelined loads stage ~64MB Parquet parts and keep at most this many queued
+PIPELINE_PART_BYTES = 64 * 1024 * 1024
+PIPELINE_QUEUE_SIZE = 4
+
+# Extraction runs a step ahead of staging in its own thread; records are handed
+# over in chunks of this many, with at most PREFETCH_QUEUE_SIZE chunks waiting
+PREFETCH_CHUNK_RECORDS = 1000
+PREFETCH_QUEUE_SIZE = 4
+
+# Extract loops log process RSS once every this many batches
+MEMORY_LOG_INTERVAL_BATCHES = 10
+
+# LZ4 on the HTTP body cuts transfer for Arrow inserts and result reads; long
+# INSERT ... SELECT FROM s3() statements need more than the default timeout
+CLICKHOUSE_CLIENT_OPTIONS = {
+    "compress": "lz4",
+    "query_limit": 0,
+    "send_receive_timeout": 600,
+}
+
+# Small incremental deltas are written with server-side batched async INSERTs
+# so frequent runs don't each create a new MergeTree part
+ASYNC_INSERT_MAX_ROWS = 100_000
+ASYNC_INSERT_SETTINGS = {
+    "async_insert": 1,
+    "wait_for_async_insert": 1,
+    "async_insert_busy_timeout_ms": 1000,
+    "async_insert_max_data_size": 10_000_000,
+}
+
+# With target_batch_bytes set, batch_size is derived from the first rows' width
+AUTOTUNE_SAMPLE_ROWS = 100
+MIN_BATCH_SIZE = 1000
+
+# Records staged as JSON may carry non-string dict keys (e.g. from BSON) and
+# numpy scalars/arrays; datetimes and UUIDs are encoded natively by orjson
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Whole-object downloads use concurrent ranged GETs once objects are large
+S3_DOWNLOAD_CONFIG = TransferConfig(
+    multipart_threshold=64 * 1024 * 1024,
+    max_concurrency=10,
+    io_chunksize=1024 * 1024,
+    use_threads=True,
+)
+
+# Column types ReplacingMergeTree accepts as its version column
+REPLACING_VERSION_TYPE = re.compile(r"^(UInt\d+|Date|Date32|DateTime|DateTime64)\b")
+NULLABLE_TYPE = re.compile(r"^Nullable\((.*)\)$")
+# Plain MergeTree tables are sorted by the tracking column when it has one of
+# the version types above, else by the first date/time column
+DATETIME_TYPE = re.compile(r"^(Date|Date32|DateTime|DateTime64)\b")
+
+# Default last_value of the extract-and-load methods: look up the target's
+# watermark. Callers that already read it pass it in (None for a fresh table).
+READ_WATERMARK = object()
+
+# Glob metacharacters in staged S3 keys, and brace alternatives fnmatch lacks
+GLOB_CHARS = re.compile(r"[*?{]")
+BRACE_GROUP = re.compile(r"\{([^}]*)\}")
+
+# ClickHouse infers staged file schemas from at most this many rows
+SCHEMA_SAMPLE_ROWS = 1000
+
+# Records streamed straight to S3 are shipped in parts of this size while
+# serialization continues; at most this many parts upload at once
+S3_STREAM_PART_SIZE = 16 * 1024 * 1024
+S3_STREAM_MAX_WORKERS = 10
+
+
+def _orjson_default(value: Any) -> Any:
+    """Encode values orjson has no native form for, e.g. Decimal or ObjectId."""
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _prefetch(iterable: Iterable, chunk_size: int = 1) -> Iterator:
+    """Drain an iterator in a background thread, yielding its items in order.
+
+    Closing the returned generator stops the thread and closes the source.
+    """
+    chunks = queue.Queue(maxsize=PREFETCH_QUEUE_SIZE)
+    stop = threading.Event()
+    end = object()
+
+    def put(entry) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        iterator = iter(iterable)
+        try:
+            while True:
+                chunk = list(itertools.islice(iterator, chunk_size))
+                if not chunk or not put((chunk, None)):
+                    break
+            put((end, None))
+        except BaseException as e:
+            put((end, e))
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk, error = chunks.get()
+            if chunk is end:
+                if error is not None:
+                    raise error
+                return
+            yield from chunk
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _gzip_writer(fileobj) -> io.BufferedWriter:
+    """Gzip-compress into ``fileobj``; closing the writer leaves ``fileobj`` open."""
+    return io.BufferedWriter(
+        gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=STAGING_GZIP_LEVEL),
+        GZIP_WRITE_BUFFER_BYTES,
+    )
+
+
+def _q(name: str) -> str:
+    """Backtick-quote a ClickHouse identifier, escaping any embedded backticks.
+
+    Names are escaped rather than matched against ``[A-Za-z_][A-Za-z0-9_]*``:
+    column names come from source documents and schemas (e.g. MongoDB fields
+    with "-" or spaces), and ClickHouse accepts any name once quoted.
+
+    Every table and column name written into SQL goes through here, generated
+    staging, temp and watermark tables included. Staging tables handed to the
+    load handlers as their FROM clause are quoted before being passed; names
+    given to ``insert``/``insert_arrow`` are quoted by clickhouse-connect.
+    """
+    if not name:
+        raise ValueError("ClickHouse identifier must not be empty")
+    return "`" + name.replace("\\", "\\\\").replace("`", "\\`") + "`"
+
+
+class S3MultipartWriter:
+    """Write-only file object that uploads to S3 in parts as data arrives.
+
+    Payloads smaller than one part are sent with a single put_object.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        bucket: str,
+        key: str,
+        part_size: int = S3_STREAM_PART_SIZE,
+        max_workers: int = S3_STREAM_MAX_WORKERS,
+    ):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.part_size = part_size
+        self.max_workers = max_workers
+
+        self._buffer = bytearray()
+        self._bytes_written = 0
+        self._upload_id = None
+        self._executor = None
+        self._pending = []
+        self._parts = []
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self._buffer += data
+        self._bytes_written += len(data)
+        if len(self._buffer) >= self.part_size:
+            self._submit_part()
+        return len(data)
+
+    def _submit_part(self) -> None:
+        if self._upload_id is None:
+            self._upload_id = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket, Key=self.key
+            )["UploadId"]
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        # Bound the parts held in memory to those actually uploading
+        if len(self._pending) >= self.max_workers:
+            self._parts.append(self._pending.pop(0).result())
+
+        part_number = len(self._parts) + len(self._pending) + 1
+        body = bytes(self._buffer)
+        self._buffer = bytearray()
+        self._pending.append(
+            self._executor.submit(self._upload_part, part_number, body)
+        )
+
+    def _upload_part(self, part_number: int, body: bytes) -> Dict[str, Any]:
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body,
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def flush(self) -> None:
+        # Parts are shipped as they fill; a partial part waits for close()
+        pass
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+
+        if self._upload_id is None:
+            self.s3_client.put_object(
+                Bucket=self.bucket, Key=self.key, Body=bytes(self._buffer)
+            )
+            return
+
+        try:
+            if self._buffer:
+                self._submit_part()
+            self._parts.extend(future.result() for future in self._pending)
+            self._pending = []
+
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._executor.shutdown()
+
+    def abort(self) -> None:
+        self.closed = True
+        if self._upload_id is None:
+            return
+
+        for future in self._pending:
+            future.cancel()
+        self._executor.shutdown()
+        self.s3_client.abort_multipart_upload(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id
+        )
+
+    def tell(self) -> int:
+        return self._bytes_written
+
+    def __enter__(self) -> "S3MultipartWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
 
 class DataSourceLoader(ABC):
     """Abstract base class for loading data from various sources to ClickHouse via S3."""
@@ -32,9 +349,26 @@ class DataSourceLoader(ABC):
         tracking_column: str = "updated_at",
         upsert_key: str = "id",
         batch_size: int = 10000,
+        staging_format: str = "json",
+        target_batch_bytes: Optional[int] = None,
+        clickhouse_client=None,
+        s3_client=None,
     ):
         self.logger = logging.getLogger(self.__class__.__name__)
 
+        if staging_format not in STAGING_FORMATS:
+            raise ValueError(
+                f"Unsupported staging format: {staging_format}. "
+                f"Must be one of {list(STAGING_FORMATS)}"
+            )
+
+        # CSV is written by the source's own export, which loaders provide as
+        # copy_to_s3; fail here rather than after the extract has started
+        if staging_format == "csv" and not hasattr(self, "copy_to_s3"):
+            raise ValueError(
+                f"{type(self).__name__} does not support the 'csv' staging format"
+            )
+
         self.clickhouse_host = clickhouse_host
         self.clickhouse_port = clickhouse_port
         self.clickhouse_user = clickhouse_user
@@ -49,28 +383,62 @@ class DataSourceLoader(ABC):
         self.tracking_column = tracking_column
         self.upsert_key = upsert_key
         self.batch_size = batch_size
+        self.target_batch_bytes = target_batch_bytes
+
+        self.staging_format = staging_format
+        self.clickhouse_format, self.file_extension = STAGING_FORMATS[staging_format]
+
+        # Clients passed in are shared with the caller, who owns their lifetime
+        self.clickhouse_client = clickhouse_client
+        self.s3_client = s3_client
+        self._owns_clickhouse_client = clickhouse_client is None
+        self._owns_s3_client = s3_client is None
 
-        self.clickhouse_client = None
-        self.s3_client = None
+        # Column name -> type by table; replaced whenever this loader creates one
+        self._schema_cache: Dict[str, Dict[str, str]] = {}
+        self._table_engines: Dict[str, str] = {}
+
+        # Reused for the periodic memory log instead of one per batch
+        self._process = psutil.Process()
+
+    def _log_memory_usage(self, batch_num: int) -> None:
+        if batch_num % MEMORY_LOG_INTERVAL_BATCHES:
+            return
+
+        try:
+            rss = self._process.memory_info().rss
+            self.logger.info(f"Memory usage: {rss / (1024 * 1024):.2f} MB")
+        except Exception as e:
+            self.logger.warning(f"Failed to get memory usage: {str(e)}")
 
     def connect_clickhouse(self) -> None:
+        if not self._owns_clickhouse_client:
+            return
+
         try:
             self.logger.info(
                 f"Connecting to ClickHouse at {self.clickhouse_host}:{self.clickhouse_port}"
             )
-            self.clickhouse_client = clickhouse_connect.get_client(
-                host=self.clickhouse_host,
-                port=self.clickhouse_port,
-                username=self.clickhouse_user,
-                password=self.clickhouse_password,
-                database=self.clickhouse_database,
-            )
+            self.clickhouse_client = self._create_clickhouse_client()
             self.logger.info("Successfully connected to ClickHouse")
         except Exception as e:
             self.logger.error(f"Failed to connect to ClickHouse: {str(e)}")
             raise
 
+    def _create_clickhouse_client(self):
+        return clickhouse_connect.get_client(
+            host=self.clickhouse_host,
+            port=self.clickhouse_port,
+            username=self.clickhouse_user,
+            password=self.clickhouse_password,
+            database=self.clickhouse_database,
+            **CLICKHOUSE_CLIENT_OPTIONS,
+        )
+
     def connect_s3(self) -> None:
+        if not self._owns_s3_client:
+            return
+
         try:
             self.logger.info("Connecting to S3")
             s3_kwargs = {
@@ -87,91 +455,174 @@ class DataSourceLoader(ABC):
             self.logger.error(f"Failed to connect to S3: {str(e)}")
             raise
 
-    def get_clickhouse_table_schema(self, table_name: str) -> Dict[str, str]:
+    def get_clickhouse_table_schema(
+        self, table_name: str, refresh: bool = False
+    ) -> Dict[str, str]:
+        if not refresh and table_name in self._schema_cache:
+            return self._schema_cache[table_name]
+
         if not self.clickhouse_client:
             self.connect_clickhouse()
 
         try:
-            query = f"DESCRIBE TABLE {table_name}"
-            result = self.clickhouse_client.query(query)
-
-            schema = {}
-            for row in result.named_results():
-                schema[row["name"]] = row["type"]
-
+            # A missing table comes back empty rather than raising
+            schema = dict(self._fetch_columns(table_name))
+            if schema:
+                self._schema_cache[table_name] = schema
             return schema
         except Exception as e:
             self.logger.error(f"Failed to get schema for table {table_name}: {str(e)}")
             raise
 
-    def upload_to_s3(self, data, s3_key: str) -> str:
+    def _fetch_columns(self, table_name: str) -> List[Tuple[str, str]]:
+        result = self.clickhouse_client.query(
+            """
+            SELECT name, type FROM system.columns
+            WHERE database = {db:String} AND table = {tbl:String}
+            ORDER BY position
+            """,
+            parameters={"db": self.clickhouse_database, "tbl": table_name},
+        )
+        return [(name, column_type) for name, column_type in result.result_rows]
+
+    def upload_to_s3(self, data, s3_key: str) -> Optional[str]:
+        if self.staging_format == "parquet":
+            return self._upload_parquet_to_s3(data, s3_key)
+
         if not self.s3_client:
             self.connect_s3()
 
         try:
-            with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
-                temp_filename = temp_file.name
-                self.logger.info(f"Created temporary file {temp_filename}")
-
-                temp_file.write("[")
-
-                is_generator = hasattr(data, "__next__")
-
-                if is_generator:
-                    first_item = True
+            # Parts ship to S3 while later records are still being serialized
+            with S3MultipartWriter(self.s3_client, self.s3_bucket, s3_key) as sink:
+                with _gzip_writer(sink) as writer:
+                    # One object per line, as ClickHouse's JSONEachRow expects;
+                    # orjson appends the newline itself
+                    write = writer.write
                     count = 0
-
                     for item in data:
-                        if not first_item:
-                            temp_file.write(",")
-                        else:
-                            first_item = False
-
-                        json.dump(item, temp_file)
+                        write(
+                            orjson.dumps(
+                                item,
+                                default=_orjson_default,
+                                option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE,
+                            )
+                        )
                         count += 1
 
                         if count % 1000 == 0:
-                            temp_file.flush()
                             self.logger.info(f"Processed {count} items")
 
                     self.logger.info(f"Processed total of {count} items")
-                else:
-                    count = len(data)
-                    if count > 0:
-                        json.dump(data[0], temp_file)
-                        for item in data[1:]:
-                            temp_file.write(",")
-                            json.dump(item, temp_file)
 
+            self.logger.info(
+                f"Successfully uploaded data to S3: s3://{self.s3_bucket}/{s3_key}"
+            )
+
+            return s3_key
+
+        except Exception as e:
+            self.logger.error(f"Failed to upload data to S3: {str(e)}")
+            raise
+
+    def _upload_parquet_to_s3(
+        self, batches: Iterator[pa.RecordBatch], s3_key: str
+    ) -> Optional[str]:
+        if not self.s3_client:
+            self.connect_s3()
+
+        sink = None
+        try:
+            writer = None
+            column_order = None
+            pending = []
+            pending_rows = 0
+            count = 0
+
+            for batch in batches:
+                if writer is None:
+                    # Row groups ship to S3 as they are written; nothing
+                    # touches local disk
+                    sink = S3MultipartWriter(self.s3_client, self.s3_bucket, s3_key)
+                    # Lead with the tracking column so its row-group min/max
+                    # statistics are tight and cheap for ClickHouse to prune on
+                    column_order = sorted(
+                        batch.schema.names,
+                        key=lambda name: name != self.tracking_column,
+                    )
+                    writer = pq.ParquetWriter(
+                        sink,
+                        pa.schema([batch.schema.field(name) for name in column_order]),
+                        compression=PARQUET_COMPRESSION,
+                        write_statistics=True,
+                        use_dictionary=True,
+                        data_page_version="2.0",
+                    )
+
+                pending.append(batch)
+                pending_rows += batch.num_rows
+                count += batch.num_rows
+
+                # Buffer batches so each row group holds ~PARQUET_ROW_GROUP_SIZE rows
+                if pending_rows >= PARQUET_ROW_GROUP_SIZE:
+                    writer.write_table(
+                        self._prepare_row_group(pending, column_order),
+                        row_group_size=PARQUET_ROW_GROUP_SIZE,
+                    )
+                    pending = []
+                    pending_rows = 0
                     self.logger.info(f"Processed {count} items")
 
-                temp_file.write("]")
-                temp_file.flush()
+            self.logger.info(f"Processed total of {count} items")
+
+            if writer is None:
+                self.logger.info("No data extracted, skipping upload")
+                return None
 
-            with open(temp_filename, "rb") as f:
-                self.s3_client.upload_fileobj(f, self.s3_bucket, s3_key)
+            if pending:
+                writer.write_table(
+                    self._prepare_row_group(pending, column_order),
+                    row_group_size=PARQUET_ROW_GROUP_SIZE,
+                )
+            writer.close()
+            sink.close()
 
             self.logger.info(
                 f"Successfully uploaded data to S3: s3://{self.s3_bucket}/{s3_key}"
             )
 
-            os.unlink(temp_filename)
-            self.logger.info(f"Deleted temporary file {temp_filename}")
-
             return s3_key
 
         except Exception as e:
+            if sink is not None:
+                sink.abort()
             self.logger.error(f"Failed to upload data to S3: {str(e)}")
             raise
 
+    def _prepare_row_group(
+        self, batches: List[pa.RecordBatch], column_order: List[str]
+    ) -> pa.Table:
+        table = pa.Table.from_batches(batches).select(column_order)
+
+        if self.tracking_column in column_order:
+            table = table.sort_by(self.tracking_column)
+
+        return table
+
     def download_from_s3(self, s3_key: str) -> List[Dict[str, Any]]:
         if not self.s3_client:
             self.connect_s3()
 
         try:
-            response = self.s3_client.get_object(Bucket=self.s3_bucket, Key=s3_key)
-            json_data = response["Body"].read().decode("utf-8")
-            data = json.loads(json_data)
+            buffer = io.BytesIO()
+            self.s3_client.download_fileobj(
+                self.s3_bucket, s3_key, buffer, Config=S3_DOWNLOAD_CONFIG
+            )
+            data = [
+                orjson.loads(line)
+                for line in buffer.getvalue().splitlines()
+                if line.strip()
+            ]
 
             self.logger.info(
                 f"Successfully downloaded data from S3: s3://{self.s3_bucket}/{s3_key}"
@@ -187,30 +638,41 @@ class DataSourceLoader(ABC):
         target_table: str,
         source: str = "s3",
         load_type: str = "incremental",
-        format: str = "JSONEachRow",
+        format: Optional[str] = None,
         derived_column: str = None,
+        order_by: Optional[str] = None,
     ) -> int:
+        if not file_key:
+            self.logger.info("No staged file to load")
+            return 0
+
+        format = format or self.clickhouse_format
+
         if not self.clickhouse_client:
             self.connect_clickhouse()
 
         self._configure_clickhouse_json_settings()
 
         try:
-            self.logger.info(f"Checking if table exists...")
-            table_exists_result = self.table_exists(target_table)
+            schema = self.get_clickhouse_table_schema(target_table)
 
-            if not table_exists_result:
+            if not schema:
                 self.logger.info(
                     f"Table '{target_table}' does not exist. Creating from file..."
                 )
                 self._create_table_from_file(
-                    file_key, target_table, source, derived_column=derived_column
+                    file_key,
+                    target_table,
+                    source,
+                    derived_column=derived_column,
+                    format=format,
+                    order_by=order_by,
                 )
                 self.logger.info(f"Table '{target_table}' created successfully.")
+                schema = self.get_clickhouse_table_schema(target_table)
             else:
                 self.logger.info(f"Table '{target_table}' exists.")
 
-            schema = self.get_clickhouse_table_schema(target_table)
             columns = list(schema.keys())
 
             if derived_column and derived_column not in columns:
@@ -220,43 +682,368 @@ class DataSourceLoader(ABC):
                 )
 
             if source.lower() == "s3":
+                file_keys = self._list_matching_keys(file_key)
+                if len(file_keys) > 1:
+                    return self._load_s3_files_in_parallel(
+                        file_keys,
+                        format,
+                        load_type,
+                        target_table,
+                        columns,
+                        derived_column,
+                    )
                 table_function = self._create_s3_table_function(file_key, format)
             elif source.lower() == "gcs":
                 table_function = self._create_gcs_table_function(file_key, format)
             else:
                 raise ValueError(f"Unsupported source: {source}. Must be 's3' or 'gcs'")
 
-            if load_type.lower() == "incremental":
-                return self._perform_incremental_load(
-                    table_function, target_table, columns, derived_column, source
+            # A single staged file is still read by parallel download/parse
+            # streams; let the INSERT side fan out to as many writers
+            settings = None
+            if source.lower() == "s3":
+                settings = {
+                    **S3_READ_SETTINGS,
+                    "max_insert_threads": MAX_PARALLEL_INSERTS,
+                }
+
+            return self._run_load(
+                load_type,
+                table_function,
+                target_table,
+                columns,
+                derived_column,
+                source,
+                settings,
+            )
+
+        except Exception as e:
+            self.logger.error(
+                f"Failed to load data to ClickHouse from {source.upper()}: {str(e)}"
+            )
+            raise
+
+    def load_arrow_to_clickhouse(
+        self,
+        arrow_data: Union[pa.Table, Iterable[pa.RecordBatch]],
+        target_table: str,
+        load_type: str = "incremental",
+        derived_column: str = None,
+        order_by: Optional[str] = None,
+    ) -> int:
+        if isinstance(arrow_data, pa.Table):
+            arrow_data = arrow_data.to_batches()
+
+        batches = (batch for batch in arrow_data if batch.num_rows > 0)
+        first_batch = next(batches, None)
+
+        if first_batch is None:
+            self.logger.info("No data to load")
+            return 0
+
+        if not self.clickhouse_client:
+            self.connect_clickhouse()
+
+        try:
+            schema = self.get_clickhouse_table_schema(target_table)
+
+            if not schema:
+                self.logger.info(
+                    f"Table '{target_table}' does not exist. Creating from Arrow schema..."
                 )
-            elif load_type.lower() == "special":
-                return self._perform_incremental_load_special(
-                    table_function, target_table, columns, derived_column, source
+                self._create_table_from_schema(
+                    target_table,
+                    self._arrow_schema_to_clickhouse(first_batch.schema),
+                    derived_column=derived_column,
+                    order_by=order_by,
                 )
-            elif load_type.lower() == "full":
-                return self._perform_full_load(
-                    table_function, target_table, columns, derived_column, source
+                schema = self.get_clickhouse_table_schema(target_table)
+
+            columns = list(schema.keys())
+
+            if derived_column and derived_column not in columns:
+                raise ValueError(
+                    f"Derived column '{derived_column}' not found in table schema. "
+                    f"Available columns: {columns}"
+                )
+
+            insert_columns = [
+                name for name in first_batch.schema.names if name in schema
+            ]
+
+            # A small delta into a table that needs no DELETE for its upsert
+            # goes straight to the target, without a staging copy
+            buffered, small_delta = [first_batch], False
+            if (
+                load_type.lower() == "incremental"
+                and not derived_column
+                and self._upserts_by_insert(target_table)
+            ):
+                buffered, small_delta = self._buffer_small_delta(first_batch, batches)
+
+            if small_delta:
+                return self._async_insert_incremental(
+                    target_table,
+                    pa.Table.from_batches(buffered).select(insert_columns),
                 )
-            elif load_type.lower() == "snapshot":
-                if not derived_column:
-                    raise ValueError(
-                        "Snapshot loads require a 'derived_column' parameter (e.g., 'snapshot_date') "
-                        "to ensure idempotency."
+
+            # insert_arrow sends each batch in Native format; staging them in a
+            # table lets every load type reuse the INSERT ... SELECT handlers
+            staging_table = f"staging_{target_table}_{uuid.uuid4().hex[:8]}"
+            self.clickhouse_client.command(
+                f"CREATE TABLE {_q(staging_table)} AS {_q(target_table)} "
+                f"ENGINE = {STAGING_ENGINE}"
+            )
+
+            try:
+                staged_rows = 0
+                for batch in itertools.chain(buffered, batches):
+                    self.clickhouse_client.insert_arrow(
+                        staging_table,
+                        pa.Table.from_batches([batch]).select(insert_columns),
                     )
-                return self._perform_snapshot_load(
-                    table_function, target_table, columns, derived_column, source
+                    staged_rows += batch.num_rows
+                self.logger.info(f"Inserted {staged_rows} rows into {staging_table}")
+
+                return self._run_load(
+                    load_type,
+                    _q(staging_table),
+                    target_table,
+                    columns,
+                    derived_column,
+                    "arrow",
                 )
-            else:
+            finally:
+                self.clickhouse_client.command(
+                    f"DROP TABLE IF EXISTS {_q(staging_table)}"
+                )
+
+        except Exception as e:
+            self.logger.error(f"Failed to load Arrow data to ClickHouse: {str(e)}")
+            raise
+
+    def _buffer_small_delta(
+        self, first_batch: pa.RecordBatch, batches: Iterator[pa.RecordBatch]
+    ) -> Tuple[List[pa.RecordBatch], bool]:
+        """Read ahead up to ASYNC_INSERT_MAX_ROWS; True if the stream ended first."""
+        buffered = [first_batch]
+        buffered_rows = first_batch.num_rows
+
+        while buffered_rows < ASYNC_INSERT_MAX_ROWS:
+            batch = next(batches, None)
+            if batch is None:
+                return buffered, True
+            buffered.append(batch)
+            buffered_rows += batch.num_rows
+
+        return buffered, False
+
+    def _upserts_by_insert(self, table_name: str) -> bool:
+        """True if an incremental load into the table is a plain INSERT.
+
+        ReplacingMergeTree collapses versions on merge, and without an upsert
+        key there is nothing to replace.
+        """
+        return not self.upsert_key or self._table_engine(table_name).startswith(
+            "Replacing"
+        )
+
+    def _async_insert_incremental(self, table_name: str, arrow_table: pa.Table) -> int:
+        if not self.upsert_key:
+            self.logger.warning("No upsert key specified, skipping upsert")
+
+        self.clickhouse_client.insert_arrow(
+            table_name, arrow_table, settings=ASYNC_INSERT_SETTINGS
+        )
+
+        # The batch is still in hand, so its max is taken here rather than
+        # read back from ClickHouse
+        if self.tracking_column in arrow_table.column_names:
+            self._record_watermark(
+                "incremental",
+                None,
+                table_name,
+                arrow_table.column_names,
+                last_value=pc.max(arrow_table[self.tracking_column]).as_py(),
+            )
+
+        self.logger.info(
+            f"Successfully loaded {arrow_table.num_rows} rows incrementally into "
+            f"{table_name} with async insert"
+        )
+        return arrow_table.num_rows
+
+    def _load_s3_files_in_parallel(
+        self,
+        file_keys: List[str],
+        format: str,
+        load_type: str,
+        target_table: str,
+        columns: List[str],
+        derived_column: str = None,
+    ) -> int:
+        staging_table = f"staging_{target_table}_{uuid.uuid4().hex[:8]}"
+        self.clickhouse_client.command(
+            f"CREATE TABLE {_q(staging_table)} AS {_q(target_table)} "
+            f"ENGINE = {STAGING_ENGINE}"
+        )
+
+        try:
+            file_columns_str = ", ".join(
+                _q(col) for col in columns if col != derived_column
+            )
+
+            def insert_file(file_key: str) -> int:
+                return self._insert_s3_file(
+                    staging_table, file_key, format, file_columns_str
+                )
+
+            max_workers = min(MAX_PARALLEL_INSERTS, len(file_keys))
+            self.logger.info(
+                f"Staging {len(file_keys)} files into {staging_table} "
+                f"with {max_workers} concurrent inserts"
+            )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                staged_rows = sum(executor.map(insert_file, file_keys))
+            self.logger.info(f"Staged {staged_rows} rows into {staging_table}")
+
+            return self._run_load(
+                load_type,
+                _q(staging_table),
+                target_table,
+                columns,
+                derived_column,
+                "s3",
+            )
+        finally:
+            self.clickhouse_client.command(f"DROP TABLE IF EXISTS {_q(staging_table)}")
+
+    def _insert_s3_file(
+        self, table_name: str, file_key: str, format: str, columns_str: str
+    ) -> int:
+        # A clickhouse-connect client cannot run concurrent queries in one
+        # session, so every concurrent insert opens its own
+        client = self._create_clickhouse_client()
+        try:
+            summary = client.command(
+                f"""
+                INSERT INTO {_q(table_name)} ({columns_str})
+                SELECT {columns_str}
+                FROM {self._create_s3_table_function(file_key, format)}
+                """,
+                settings={
+                    **S3_READ_SETTINGS,
+                    "max_insert_threads": MAX_PARALLEL_INSERTS,
+                },
+            )
+            return summary.written_rows
+        finally:
+            client.close()
+
+    def _run_load(
+        self,
+        load_type: str,
+        table_function: str,
+        target_table: str,
+        columns: List[str],
+        derived_column: str = None,
+        source: str = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """Run one load type from ``table_function`` into ``target_table``.
+
+        ``table_function`` is used as a FROM clause: an ``s3()``/``gcs()``
+        table function or an already quoted staging table.
+        """
+        if load_type.lower() == "incremental":
+            rows_loaded = self._perform_incremental_load(
+                table_function, target_table, columns, derived_column, source, settings
+            )
+        elif load_type.lower() == "special":
+            rows_loaded = self._perform_incremental_load_special(
+                table_function, target_table, columns, derived_column, source, settings
+            )
+        elif load_type.lower() == "full":
+            rows_loaded = self._perform_full_load(
+                table_function, target_table, columns, derived_column, source, settings
+            )
+        elif load_type.lower() == "snapshot":
+            if not derived_column:
                 raise ValueError(
-                    f"Unsupported load type: {load_type}. Must be 'incremental', 'full', or 'snapshot'"
+                    "Snapshot loads require a 'derived_column' parameter (e.g., 'snapshot_date') "
+                    "to ensure idempotency."
                 )
+            return self._perform_snapshot_load(
+                table_function, target_table, columns, derived_column, source, settings
+            )
+        else:
+            raise ValueError(
+                f"Unsupported load type: {load_type}. Must be 'incremental', 'full', or 'snapshot'"
+            )
+
+        if rows_loaded:
+            self._record_watermark(
+                load_type, table_function, target_table, columns, settings=settings
+            )
+        return rows_loaded
+
+    def _record_watermark(
+        self,
+        load_type: str,
+        source: Optional[str],
+        target_table: str,
+        columns: List[str],
+        last_value: Any = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Keep the loaded batch's max tracking value in {target_table}_watermark.
+
+        ``source`` is the FROM clause the batch was loaded from, so the max is
+        taken over the staged rows only, never the whole target. Without one,
+        the caller passes the batch max it already computed as ``last_value``.
+
+        A stale watermark only means the next incremental run re-reads rows
+        that the upsert then replaces, so failures here are not fatal.
+        """
+        if self.tracking_column not in columns:
+            return
+
+        watermark_table = f"{target_table}_watermark"
+        try:
+            tracking_type = self.get_clickhouse_table_schema(target_table)[
+                self.tracking_column
+            ]
+            self.clickhouse_client.command(f"""
+                CREATE TABLE IF NOT EXISTS {_q(watermark_table)} (
+                    last_value {tracking_type},
+                    loaded_at DateTime DEFAULT now()
+                ) ENGINE = MergeTree() ORDER BY loaded_at
+                """)
+
+            # A full reload can move the watermark backwards
+            if load_type.lower() == "full":
+                self.clickhouse_client.command(f"TRUNCATE TABLE {_q(watermark_table)}")
+
+            if source is None:
+                if last_value is not None:
+                    self.clickhouse_client.insert(
+                        watermark_table, [[last_value]], column_names=["last_value"]
+                    )
+                return
 
+            self.clickhouse_client.command(
+                f"""
+                INSERT INTO {_q(watermark_table)} (last_value)
+                SELECT max({_q(self.tracking_column)}) FROM {source}
+                WHERE {_q(self.tracking_column)} IS NOT NULL
+                HAVING count() > 0
+                """,
+                settings=settings,
+            )
         except Exception as e:
-            self.logger.error(
-                f"Failed to load data to ClickHouse from {source.upper()}: {str(e)}"
+            self.logger.warning(
+                f"Could not update watermark for {target_table}: {str(e)}"
             )
-            raise
 
     def _create_s3_table_function(self, s3_key: str, format: str) -> str:
         s3_access_key = self.s3_access_key
@@ -272,6 +1059,45 @@ class DataSourceLoader(ABC):
 
         return f"s3('{s3_uri}','{s3_access_key}','{s3_secret_key}','{format}')"
 
+    def _resolve_sample_key(self, file_key: str) -> str:
+        return self._list_matching_keys(file_key)[0]
+
+    def _list_matching_keys(self, file_key: str) -> List[str]:
+        if not any(char in file_key for char in "*?{"):
+            return [file_key]
+
+        if not self.s3_client:
+            self.connect_s3()
+
+        prefix = GLOB_CHARS.split(file_key, maxsplit=1)[0]
+        pattern = BRACE_GROUP.sub("*", file_key)
+
+        keys = []
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                if fnmatch.fnmatchcase(obj["Key"], pattern):
+                    keys.append(obj["Key"])
+
+        if not keys:
+            raise ValueError(f"No S3 objects match {file_key}")
+
+        return keys
+
+    def _select_lists(
+        self, columns: List[str], derived_column: str = None
+    ) -> Tuple[str, str]:
+        """Return the INSERT column list and the matching SELECT list."""
+        columns_str = ", ".join(map(_q, columns))
+        if derived_column not in columns:
+            return columns_str, columns_str
+
+        select_columns_str = ", ".join(
+            f"today() AS {_q(col)}" if col == derived_column else _q(col)
+            for col in columns
+        )
+        return columns_str, select_columns_str
+
     def _perform_incremental_load(
         self,
         table_function: str,
@@ -279,35 +1105,33 @@ class DataSourceLoader(ABC):
         columns: List[str],
         derived_column: str = None,
         source: str = None,
+        settings: Optional[Dict[str, Any]] = None,
     ) -> int:
+        if self._table_engine(table_name).startswith("Replacing"):
+            return self._perform_replacing_load(
+                table_function, table_name, columns, derived_column, source, settings
+            )
+
         temp_table = f"temp_{table_name}_{uuid.uuid4().hex[:8]}"
         create_temp_table_query = (
-            f"CREATE TABLE {temp_table} AS {table_name} ENGINE = Memory"
+            f"CREATE TABLE {_q(temp_table)} AS {_q(table_name)} "
+            f"ENGINE = {STAGING_ENGINE}"
         )
         self.clickhouse_client.command(create_temp_table_query)
 
         try:
-            columns_str = ", ".join(columns)
-
-            select_columns = []
-            for col in columns:
-                if derived_column and col == derived_column:
-                    select_columns.append(f"today() as {derived_column}")
-                elif col in columns:
-                    select_columns.append(col)
-
-            select_columns_str = ", ".join(select_columns)
+            columns_str, select_columns_str = self._select_lists(
+                columns, derived_column
+            )
 
             insert_query = f"""
-            INSERT INTO {temp_table} ({columns_str})
+            INSERT INTO {_q(temp_table)} ({columns_str})
             SELECT {select_columns_str} FROM {table_function}
             """
             self.logger.info(f"Insert query: {insert_query}")
-            self.clickhouse_client.command(insert_query)
-
-            count_query = f"SELECT count() FROM {temp_table}"
-            result = self.clickhouse_client.query(count_query)
-            row_count = result.result_rows[0][0]
+            # The insert summary reports the rows staged, sparing a count() scan
+            summary = self.clickhouse_client.command(insert_query, settings=settings)
+            row_count = summary.written_rows
 
             if row_count == 0:
                 self.logger.info("No data to load")
@@ -315,16 +1139,16 @@ class DataSourceLoader(ABC):
 
             if self.upsert_key:
                 delete_query = f"""
-                DELETE FROM {table_name} WHERE {self.upsert_key} IN 
-                (SELECT {self.upsert_key} FROM {temp_table})
+                DELETE FROM {_q(table_name)} WHERE {_q(self.upsert_key)} IN
+                (SELECT {_q(self.upsert_key)} FROM {_q(temp_table)})
                 """
                 self.clickhouse_client.command(delete_query)
             else:
                 self.logger.warning("No upsert key specified, skipping upsert")
 
+            # The temp table was created AS the target, so its columns line up
             insert_from_temp_query = f"""
-            INSERT INTO {table_name} ({columns_str})
-            SELECT {columns_str} FROM {temp_table}
+            INSERT INTO {_q(table_name)} SELECT * FROM {_q(temp_table)}
             """
             self.clickhouse_client.command(insert_from_temp_query)
 
@@ -334,9 +1158,36 @@ class DataSourceLoader(ABC):
             return row_count
 
         finally:
-            drop_temp_table_query = f"DROP TABLE IF EXISTS {temp_table}"
+            drop_temp_table_query = f"DROP TABLE IF EXISTS {_q(temp_table)}"
             self.clickhouse_client.command(drop_temp_table_query)
 
+    def _perform_replacing_load(
+        self,
+        table_function: str,
+        table_name: str,
+        columns: List[str],
+        derived_column: str = None,
+        source: str = None,
+        settings: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        # ReplacingMergeTree keeps the newest version per key on merge, so the
+        # delta is inserted as-is; readers needing exact results use FINAL
+        columns_str, select_columns_str = self._select_lists(columns, derived_column)
+
+        summary = self.clickhouse_client.command(
+            f"""
+            INSERT INTO {_q(table_name)} ({columns_str})
+            SELECT {select_columns_str} FROM {table_function}
+            """,
+            settings=settings,
+        )
+        row_count = summary.written_rows
+
+        self.logger.info(
+            f"Successfully loaded {row_count} rows incrementally into {table_name} from {source.upper()}"
+        )
+        return row_count
+
     def _perform_incremental_load_special(
         self,
         table_function: str,
@@ -344,35 +1195,27 @@ class DataSourceLoader(ABC):
         columns: List[str],
         derived_column: str = None,
         source: str = None,
+        settings: Optional[Dict[str, Any]] = None,
     ) -> int:
         temp_table = f"temp_{table_name}_{uuid.uuid4().hex[:8]}"
         create_temp_table_query = (
-            f"CREATE TABLE {temp_table} AS {table_name} ENGINE = Memory"
+            f"CREATE TABLE {_q(temp_table)} AS {_q(table_name)} "
+            f"ENGINE = {STAGING_ENGINE}"
         )
         self.clickhouse_client.command(create_temp_table_query)
 
         try:
-            columns_str = ", ".join(columns)
-
-            select_columns = []
-            for col in columns:
-                if derived_column and col == derived_column:
-                    select_columns.append(f"today() as {derived_column}")
-                elif col in columns:
-                    select_columns.append(col)
-
-            select_columns_str = ", ".join(select_columns)
+            columns_str, select_columns_str = self._select_lists(
+                columns, derived_column
+            )
 
             insert_query = f"""
-            INSERT INTO {temp_table} ({columns_str})
+            INSERT INTO {_q(temp_table)} ({columns_str})
             SELECT {select_columns_str} FROM {table_function}
             """
             self.logger.info(f"Insert query: {insert_query}")
-            self.clickhouse_client.command(insert_query)
-
-            count_query = f"SELECT count() FROM {temp_table}"
-            result = self.clickhouse_client.query(count_query)
-            temp_row_count = result.result_rows[0][0]
+            summary = self.clickhouse_client.command(insert_query, settings=settings)
+            temp_row_count = summary.written_rows
 
             if temp_row_count == 0:
                 self.logger.info("No data to load")
@@ -380,70 +1223,46 @@ class DataSourceLoader(ABC):
 
             if self.upsert_key:
                 delete_query = f"""
-                DELETE FROM {table_name} WHERE {self.upsert_key} IN 
-                (SELECT {self.upsert_key} FROM {temp_table})
+                DELETE FROM {_q(table_name)} WHERE {_q(self.upsert_key)} IN
+                (SELECT {_q(self.upsert_key)} FROM {_q(temp_table)})
                 """
                 self.clickhouse_client.command(delete_query)
             else:
                 self.logger.warning("No upsert key specified, skipping upsert")
 
-            insert_from_temp_query = f"""
-            INSERT INTO {table_name} ({columns_str})
-            SELECT {columns_str} FROM {temp_table}
-            """
-            self.clickhouse_client.command(insert_from_temp_query)
-            self.logger.info(f"Inserted {temp_row_count} rows into {table_name}")
-
-            final_row_count = temp_row_count
-
-            if (
+            can_deduplicate = (
                 self.upsert_key
                 and self.tracking_column
                 and self.upsert_key in columns
                 and self.tracking_column in columns
-            ):
-                self.logger.info(
-                    f"Starting deduplication: keeping latest {self.tracking_column} per {self.upsert_key}"
-                )
-
-                duplicate_check_query = f"""
-                SELECT count() as duplicate_groups
-                FROM (
-                    SELECT {self.upsert_key}, count() as cnt
-                    FROM {table_name}
-                    GROUP BY {self.upsert_key}
-                    HAVING cnt > 1
-                ) duplicates
-                """
-
-                result = self.clickhouse_client.query(duplicate_check_query)
-                duplicate_groups = result.result_rows[0][0]
-
-                if duplicate_groups > 0:
-                    self.logger.info(
-                        f"Found {duplicate_groups} groups with duplicates, cleaning up..."
-                    )
-
-                    dedup_delete_query = f"""
-                    DELETE FROM {table_name}
-                    WHERE ({self.upsert_key}, {self.tracking_column}) NOT IN (
-                        SELECT {self.upsert_key}, MAX({self.tracking_column})
-                        FROM {table_name}
-                        GROUP BY {self.upsert_key}
-                    )
-                    """
+            )
 
-                    self.clickhouse_client.command(dedup_delete_query)
+            # The temp table was created AS the target, so its columns line up.
+            # Its keys were just deleted from the target, so keeping only the
+            # batch's newest row per key leaves one row per key behind
+            latest_per_key = (
+                f"ORDER BY {_q(self.upsert_key)}, {_q(self.tracking_column)} DESC "
+                f"LIMIT 1 BY {_q(self.upsert_key)}"
+                if can_deduplicate
+                else ""
+            )
+            insert_from_temp_query = f"""
+            INSERT INTO {_q(table_name)} SELECT * FROM {_q(temp_table)}
+            {latest_per_key}
+            """
+            summary = self.clickhouse_client.command(insert_from_temp_query)
+            self.logger.info(
+                f"Inserted {summary.written_rows} of {temp_row_count} staged rows "
+                f"into {table_name}"
+            )
 
-                    final_count_query = f"SELECT count() FROM {table_name}"
-                    result = self.clickhouse_client.query(final_count_query)
-                    final_row_count = result.result_rows[0][0]
+            final_row_count = summary.written_rows
 
-                    duplicates_removed = temp_row_count - final_row_count
-                    self.logger.info(f"Removed {duplicates_removed} duplicate records")
-                    self.logger.info(f"Final state: {final_row_count} unique records")
-                else:
-                    self.logger.info("No duplicates found")
+            if can_deduplicate:
+                # Collapses duplicates left by earlier or concurrent loads
+                self.logger.info(f"Deduplicating {table_name} on {self.upsert_key}")
+                final_row_count = self._deduplicate_latest(table_name)
+                self.logger.info(f"Final state: {final_row_count} unique records")
             else:
                 missing_requirements = []
                 if not self.upsert_key:
@@ -471,9 +1290,48 @@ class DataSourceLoader(ABC):
             return final_row_count
 
         finally:
-            drop_temp_table_query = f"DROP TABLE IF EXISTS {temp_table}"
+            drop_temp_table_query = f"DROP TABLE IF EXISTS {_q(temp_table)}"
             self.clickhouse_client.command(drop_temp_table_query)
 
+    def _deduplicate_latest(self, table_name: str) -> int:
+        """Collapse rows sharing an upsert key; returns rows kept.
+
+        ReplacingMergeTree tables keep the newest version with OPTIMIZE FINAL.
+        Other tables use OPTIMIZE FINAL DEDUPLICATE BY the upsert key plus
+        the table's key columns, which ClickHouse requires in the list; older
+        versions don't get that far, as special loads delete a batch's keys
+        and insert only its newest row per key. Either way, partitions
+        already merged into one part are skipped.
+        """
+        settings = {"optimize_skip_merged_partitions": 1}
+        if self._table_engine(table_name).startswith("Replacing"):
+            self.clickhouse_client.command(
+                f"OPTIMIZE TABLE {_q(table_name)} FINAL", settings=settings
+            )
+        else:
+            result = self.clickhouse_client.query(
+                """
+                SELECT name FROM system.columns
+                WHERE database = {db:String} AND table = {tbl:String}
+                AND (is_in_partition_key OR is_in_sorting_key
+                     OR is_in_primary_key OR is_in_sampling_key)
+                ORDER BY position
+                """,
+                parameters={"db": self.clickhouse_database, "tbl": table_name},
+            )
+            dedup_columns = [self.upsert_key] + [
+                name for (name,) in result.result_rows if name != self.upsert_key
+            ]
+            self.clickhouse_client.command(
+                f"OPTIMIZE TABLE {_q(table_name)} FINAL "
+                f"DEDUPLICATE BY {', '.join(map(_q, dedup_columns))}",
+                settings=settings,
+            )
+
+        # Answered from part metadata, not a scan
+        result = self.clickhouse_client.query(f"SELECT count() FROM {_q(table_name)}")
+        return result.result_rows[0][0]
+
     def _perform_full_load(
         self,
         table_function: str,
@@ -481,34 +1339,28 @@ class DataSourceLoader(ABC):
         columns: List[str],
         derived_column: str = None,
         source: str = None,
+        settings: Optional[Dict[str, Any]] = None,
     ) -> int:
-        count_query = f"SELECT count() FROM {table_function}"
-        result = self.clickhouse_client.query(count_query)
-        row_count = result.result_rows[0][0]
-
-        if row_count == 0:
+        # Probe for a first row rather than counting, so an empty extract
+        # keeps the current table without reading the staged files twice
+        probe = self.clickhouse_client.query(
+            f"SELECT 1 FROM {table_function} LIMIT 1", settings=settings
+        )
+        if probe.row_count == 0:
             self.logger.info("No data to load")
             return 0
 
-        truncate_query = f"TRUNCATE TABLE {table_name}"
+        truncate_query = f"TRUNCATE TABLE {_q(table_name)}"
         self.clickhouse_client.command(truncate_query)
 
-        columns_str = ", ".join(columns)
-
-        select_columns = []
-        for col in columns:
-            if derived_column and col == derived_column:
-                select_columns.append(f"today() as {derived_column}")
-            elif col in columns:
-                select_columns.append(col)
-
-        select_columns_str = ", ".join(select_columns)
+        columns_str, select_columns_str = self._select_lists(columns, derived_column)
 
         insert_query = f"""
-        INSERT INTO {table_name} ({columns_str})
+        INSERT INTO {_q(table_name)} ({columns_str})
         SELECT {select_columns_str} FROM {table_function}
         """
-        self.clickhouse_client.command(insert_query)
+        summary = self.clickhouse_client.command(insert_query, settings=settings)
+        row_count = summary.written_rows
 
         self.logger.info(
             f"Successfully loaded {row_count} rows into {table_name} (full load) from {source.upper()}"
@@ -522,6 +1374,7 @@ class DataSourceLoader(ABC):
         columns: List[str],
         derived_column: str = None,
         source: str = None,
+        settings: Optional[Dict[str, Any]] = None,
     ) -> int:
         if not derived_column:
             self.logger.warning(
@@ -529,59 +1382,36 @@ class DataSourceLoader(ABC):
             )
             raise ValueError("derived_column must be specified for snapshot loads")
 
-        temp_table = f"temp_{table_name}_{uuid.uuid4().hex[:8]}"
-        create_temp_table_query = (
-            f"CREATE TABLE {temp_table} AS {table_name} ENGINE = Memory"
+        # Probe for a first row instead of counting, so an empty extract
+        # leaves today's snapshot untouched without scanning the source twice
+        probe = self.clickhouse_client.query(
+            f"SELECT 1 FROM {table_function} LIMIT 1", settings=settings
         )
-        self.clickhouse_client.command(create_temp_table_query)
-
-        try:
-            columns_str = ", ".join(columns)
-
-            select_columns = []
-            for col in columns:
-                if col == derived_column:
-                    select_columns.append(f"today() as {derived_column}")
-                else:
-                    select_columns.append(col)
-
-            select_columns_str = ", ".join(select_columns)
-
-            insert_query = f"""
-            INSERT INTO {temp_table} ({columns_str})
-            SELECT {select_columns_str} FROM {table_function}
-            """
-            self.logger.info(f"Insert query: {insert_query}")
-            self.clickhouse_client.command(insert_query)
-
-            count_query = f"SELECT count() FROM {temp_table}"
-            result = self.clickhouse_client.query(count_query)
-            row_count = result.result_rows[0][0]
-
-            if row_count == 0:
-                self.logger.info("No data to load")
-                return 0
+        if probe.row_count == 0:
+            self.logger.info("No data to load")
+            return 0
 
-            delete_query = f"""
-            ALTER TABLE {table_name} DELETE WHERE {derived_column} = today()
-            """
-            self.clickhouse_client.command(delete_query)
-            self.logger.info(f"Deleted existing records for today from {table_name}")
+        delete_query = f"""
+        ALTER TABLE {_q(table_name)} DELETE WHERE {_q(derived_column)} = today()
+        """
+        self.clickhouse_client.command(delete_query)
+        self.logger.info(f"Deleted existing records for today from {table_name}")
 
-            insert_from_temp_query = f"""
-            INSERT INTO {table_name} ({columns_str})
-            SELECT {columns_str} FROM {temp_table}
-            """
-            self.clickhouse_client.command(insert_from_temp_query)
+        columns_str, select_columns_str = self._select_lists(columns, derived_column)
 
-            self.logger.info(
-                f"Successfully loaded {row_count} rows as snapshot into {table_name} from {source.upper()}"
-            )
-            return row_count
+        # Written straight into the target; no server-side staging copy of the batch
+        insert_query = f"""
+        INSERT INTO {_q(table_name)} ({columns_str})
+        SELECT {select_columns_str} FROM {table_function}
+        """
+        self.logger.info(f"Insert query: {insert_query}")
+        summary = self.clickhouse_client.command(insert_query, settings=settings)
+        row_count = summary.written_rows
 
-        finally:
-            drop_temp_table_query = f"DROP TABLE IF EXISTS {temp_table}"
-            self.clickhouse_client.command(drop_temp_table_query)
+        self.logger.info(
+            f"Successfully loaded {row_count} rows as snapshot into {table_name} from {source.upper()}"
+        )
+        return row_count
 
     def get_last_loaded_value(self, table_name: str) -> Optional[str]:
         if not self.clickhouse_client:
@@ -594,10 +1424,29 @@ class DataSourceLoader(ABC):
             return None
 
         try:
-            query = (
-                f"SELECT MAX({self.tracking_column}) as last_value FROM {table_name}"
+            watermark_table = f"{table_name}_watermark"
+            if self.table_exists(watermark_table):
+                result = self.clickhouse_client.query(
+                    "SELECT max(last_value) FROM {tbl:Identifier} HAVING count() > 0",
+                    parameters={"tbl": watermark_table},
+                )
+                if result.row_count > 0:
+                    return result.first_row[0]
+
+            # Reading the newest row in sort order lets tables ordered by the
+            # tracking column answer from the primary index instead of a full scan
+            # Identifiers are bound server-side so every table shares one query text
+            query = """
+            SELECT {col:Identifier} AS last_value FROM {tbl:Identifier}
+            WHERE {col:Identifier} IS NOT NULL
+            ORDER BY {col:Identifier} DESC
+            LIMIT 1
+            """
+            result = self.clickhouse_client.query(
+                query,
+                parameters={"tbl": table_name, "col": self.tracking_column},
+                settings={"optimize_read_in_order": 1},
             )
-            result = self.clickhouse_client.query(query)
 
             if result.row_count > 0:
                 last_value = result.first_row[0]
@@ -608,7 +1457,7 @@ class DataSourceLoader(ABC):
             raise
 
     def close_connections(self) -> None:
-        if self.clickhouse_client:
+        if self.clickhouse_client and self._owns_clickhouse_client:
             try:
                 self.clickhouse_client.close()
                 self.logger.info("Closed ClickHouse connection")
@@ -628,6 +1477,289 @@ class DataSourceLoader(ABC):
     def connect_source(self) -> None:
         pass
 
+    def extract_record_batches(
+        self,
+        source_table: str,
+        last_value: Optional[str] = None,
+        source_schema: str = None,
+        **kwargs,
+    ) -> Iterator[pa.RecordBatch]:
+        schema = None
+        rows = iter(
+            self.extract_data(source_table, last_value, source_schema, **kwargs)
+        )
+
+        if self.target_batch_bytes:
+            sample = list(itertools.islice(rows, AUTOTUNE_SAMPLE_ROWS))
+            if len(sample) == AUTOTUNE_SAMPLE_ROWS:
+                self._autotune_batch_size(self._rows_to_record_batch(sample))
+            rows = itertools.chain(sample, rows)
+
+        # Each batch's rows are sliced off the generator in one list() call
+        while True:
+            chunk = list(itertools.islice(rows, self.batch_size))
+            if not chunk:
+                break
+            batch = self._rows_to_record_batch(chunk, schema)
+            schema = batch.schema
+            yield batch
+
+    def _autotune_batch_size(self, sample: Union[pa.Table, pa.RecordBatch]) -> None:
+        if not self.target_batch_bytes or sample.num_rows == 0:
+            return
+
+        avg_row_bytes = max(1, sample.nbytes // sample.num_rows)
+        self.batch_size = max(MIN_BATCH_SIZE, self.target_batch_bytes // avg_row_bytes)
+        self.logger.info(
+            f"Autotuned batch_size to {self.batch_size} rows (~{avg_row_bytes} bytes/row)"
+        )
+
+    def _rows_to_record_batch(
+        self, rows: List[Dict[str, Any]], schema: Optional[pa.Schema] = None
+    ) -> pa.RecordBatch:
+        if schema is not None:
+            return pa.RecordBatch.from_pylist(rows, schema=schema)
+
+        batch = pa.RecordBatch.from_pylist(rows)
+
+        # Columns that are entirely null in the first batch have no usable type
+        if any(pa.types.is_null(field.type) for field in batch.schema):
+            schema = pa.schema(
+                [
+                    (
+                        field.with_type(pa.string())
+                        if pa.types.is_null(field.type)
+                        else field
+                    )
+                    for field in batch.schema
+                ]
+            )
+            batch = pa.RecordBatch.from_pylist(rows, schema=schema)
+
+        return batch
+
+    def extract_and_load_direct(
+        self,
+        source_table: str,
+        target_table: str,
+        source_schema: str = None,
+        load_type: str = "incremental",
+        derived_column: str = None,
+        tracking_range: Optional[Tuple[Any, Any]] = None,
+        last_value: Any = READ_WATERMARK,
+        **kwargs,
+    ) -> int:
+        try:
+            self.logger.info(
+                f"Starting direct {load_type} load from {source_table} to {target_table}"
+            )
+
+            self.connect_source()
+            self.connect_clickhouse()
+
+            # A [lo, hi) tracking range replaces the watermark, e.g. for backfills
+            if tracking_range is not None:
+                last_value = None
+                kwargs["tracking_range"] = tracking_range
+                self.logger.info(
+                    f"Loading {self.tracking_column} in [{tracking_range[0]}, "
+                    f"{tracking_range[1]})"
+                )
+            elif load_type.lower() in ["incremental", "special"]:
+                if last_value is READ_WATERMARK:
+                    last_value = self.get_last_loaded_value(target_table)
+                self.logger.info(
+                    f"Last loaded value of {self.tracking_column}: {last_value}"
+                )
+            else:
+                last_value = None
+
+            batches = self.extract_record_batches(
+                source_table, last_value, source_schema, **kwargs
+            )
+
+            return self.load_arrow_to_clickhouse(
+                batches,
+                target_table,
+                load_type=load_type,
+                derived_column=derived_column,
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error during direct load of {source_table}: {str(e)}")
+            raise
+        finally:
+            self.close_connections()
+
+    def extract_and_load_pipelined(
+        self,
+        source_table: str,
+        target_table: str,
+        source_schema: str = None,
+        load_type: str = "incremental",
+        derived_column: str = None,
+        tracking_range: Optional[Tuple[Any, Any]] = None,
+        last_value: Any = READ_WATERMARK,
+        **kwargs,
+    ) -> int:
+        if self.staging_format != "parquet":
+            raise ValueError("Pipelined loads require the 'parquet' staging format")
+
+        try:
+            self.logger.info(
+                f"Starting pipelined {load_type} load from {source_table} to {target_table}"
+            )
+
+            self.connect_source()
+            self.connect_clickhouse()
+            if not self.s3_client:
+                self.connect_s3()
+
+            # A [lo, hi) tracking range replaces the watermark, e.g. for backfills
+            if tracking_range is not None:
+                last_value = None
+                kwargs["tracking_range"] = tracking_range
+                self.logger.info(
+                    f"Loading {self.tracking_column} in [{tracking_range[0]}, "
+                    f"{tracking_range[1]})"
+                )
+            elif load_type.lower() in ["incremental", "special"]:
+                if last_value is READ_WATERMARK:
+                    last_value = self.get_last_loaded_value(target_table)
+                self.logger.info(
+                    f"Last loaded value of {self.tracking_column}: {last_value}"
+                )
+            else:
+                last_value = None
+
+            batches = (
+                batch
+                for batch in self.extract_record_batches(
+                    source_table, last_value, source_schema, **kwargs
+                )
+                if batch.num_rows > 0
+            )
+            first_batch = next(batches, None)
+
+            if first_batch is None:
+                self.logger.info("No data to load")
+                return 0
+
+            schema = self.get_clickhouse_table_schema(target_table)
+
+            if not schema:
+                self._create_table_from_schema(
+                    target_table,
+                    self._arrow_schema_to_clickhouse(first_batch.schema),
+                    derived_column=derived_column,
+                )
+                schema = self.get_clickhouse_table_schema(target_table)
+
+            columns = list(schema.keys())
+            file_columns_str = ", ".join(
+                _q(col) for col in columns if col != derived_column
+            )
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            prefix = f"{load_type}/{source_table}_to_{target_table}_{timestamp}"
+
+            staging_table = f"staging_{target_table}_{uuid.uuid4().hex[:8]}"
+            self.clickhouse_client.command(
+                f"CREATE TABLE {_q(staging_table)} AS {_q(target_table)} "
+                f"ENGINE = {STAGING_ENGINE}"
+            )
+
+            try:
+                part_keys = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+                failed = threading.Event()
+                errors = []
+
+                def consume() -> int:
+                    staged = 0
+                    while True:
+                        part_key = part_keys.get()
+                        if part_key is None:
+                            return staged
+                        # Keep draining after a failure so the producer never blocks
+                        if failed.is_set():
+                            continue
+                        try:
+                            staged += self._insert_s3_file(
+                                staging_table,
+                                part_key,
+                                self.clickhouse_format,
+                                file_columns_str,
+                            )
+                        except Exception as e:
+                            self.logger.error(f"Failed to load {part_key}: {str(e)}")
+                            errors.append(e)
+                            failed.set()
+
+                self.logger.info(f"Streaming parts to s3://{self.s3_bucket}/{prefix}/")
+                with ThreadPoolExecutor(max_workers=MAX_PARALLEL_INSERTS) as executor:
+                    consumers = [
+                        executor.submit(consume) for _ in range(MAX_PARALLEL_INSERTS)
+                    ]
+                    try:
+                        parts = self._chunk_batches_by_size(
+                            itertools.chain([first_batch], batches)
+                        )
+                        for part_num, part in enumerate(parts):
+                            if failed.is_set():
+                                break
+                            part_key = f"{prefix}/part_{part_num:05d}.parquet"
+                            self._upload_parquet_to_s3(iter(part), part_key)
+                            part_keys.put(part_key)
+                    finally:
+                        for _ in consumers:
+                            part_keys.put(None)
+
+                    staged_rows = sum(consumer.result() for consumer in consumers)
+
+                if errors:
+                    raise errors[0]
+
+                self.logger.info(f"Staged {staged_rows} rows into {staging_table}")
+
+                return self._run_load(
+                    load_type,
+                    _q(staging_table),
+                    target_table,
+                    columns,
+                    derived_column,
+                    "s3",
+                )
+            finally:
+                self.clickhouse_client.command(
+                    f"DROP TABLE IF EXISTS {_q(staging_table)}"
+                )
+
+        except Exception as e:
+            self.logger.error(
+                f"Error during pipelined load of {source_table}: {str(e)}"
+            )
+            raise
+        finally:
+            self.close_connections()
+
+    def _chunk_batches_by_size(
+        self, batches: Iterable[pa.RecordBatch]
+    ) -> Iterator[List[pa.RecordBatch]]:
+        part = []
+        part_bytes = 0
+
+        for batch in batches:
+            part.append(batch)
+            part_bytes += batch.nbytes
+
+            if part_bytes >= PIPELINE_PART_BYTES:
+                yield part
+                part = []
+                part_bytes = 0
+
+        if part:
+            yield part
+
     def extract_to_storage(
         self,
         source_table: str,
@@ -638,6 +1770,7 @@ class DataSourceLoader(ABC):
         output_key: str = None,
         **kwargs,
     ) -> str:
+        data_generator = None
         try:
             self.logger.info(
                 f"Starting {load_type} extraction from {source_table} to {destination.upper()}"
@@ -658,23 +1791,48 @@ class DataSourceLoader(ABC):
                     f"Last loaded value of {self.tracking_column}: {last_value}"
                 )
 
-            data_generator = self.extract_data(
-                source_table, last_value, source_schema, **kwargs
-            )
-
             if output_key:
                 storage_key = output_key
             else:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 storage_key = (
-                    f"{load_type}/{source_table}_to_{target_table}_{timestamp}.json"
+                    f"{load_type}/{source_table}_to_{target_table}_{timestamp}"
+                    f".{self.file_extension}"
                 )
 
-            if destination.lower() == "s3":
-                storage_key = self.upload_to_s3(data_generator, storage_key)
-                self.logger.info(
-                    f"Data extracted to S3: s3://{self.s3_bucket}/{storage_key}"
+            if self.staging_format == "csv":
+                # The source streams its own CSV export; nothing is built here
+                if destination.lower() != "s3":
+                    raise ValueError("CSV staging only supports the 's3' destination")
+                data_generator = None
+            elif self.staging_format == "parquet":
+                # Reading the source overlaps with encoding and uploading
+                data_generator = _prefetch(
+                    self.extract_record_batches(
+                        source_table, last_value, source_schema, **kwargs
+                    )
                 )
+            else:
+                data_generator = _prefetch(
+                    self.extract_data(
+                        source_table, last_value, source_schema, **kwargs
+                    ),
+                    chunk_size=PREFETCH_CHUNK_RECORDS,
+                )
+
+            if destination.lower() == "s3":
+                if data_generator is None:
+                    storage_key = self.copy_to_s3(
+                        source_table, storage_key, last_value, source_schema, **kwargs
+                    )
+                else:
+                    storage_key = self.upload_to_s3(data_generator, storage_key)
+                if storage_key:
+                    self.logger.info(
+                        f"Data extracted to S3: s3://{self.s3_bucket}/{storage_key}"
+                    )
+                else:
+                    self.logger.info(f"No rows extracted from {source_table}")
             elif destination.lower() == "gcs":
                 storage_key = self.upload_to_gcs(data_generator, storage_key)
                 self.logger.info(
@@ -689,6 +1847,8 @@ class DataSourceLoader(ABC):
             )
             raise
         finally:
+            if data_generator is not None:
+                data_generator.close()
             self.close_connections()
 
     def extract_to_s3(
@@ -721,19 +1881,7 @@ class DataSourceLoader(ABC):
             self.logger.warning(f"Could not apply ClickHouse JSON settings: {e}")
 
     def table_exists(self, table_name: str) -> bool:
-        self._configure_clickhouse_json_settings()
-
-        query = f"""
-        SELECT count() 
-        FROM system.tables 
-        WHERE database = '{self.clickhouse_database}' 
-          AND name = '{table_name}'
-        """
-
-        result = self.clickhouse_client.query(query)
-        count = result.result_rows[0][0]
-
-        return count > 0
+        return bool(self.get_clickhouse_table_schema(table_name))
 
     def _create_table_from_file(
         self,
@@ -741,145 +1889,177 @@ class DataSourceLoader(ABC):
         target_table: str,
         source: str = "s3",
         derived_column: str = None,
+        format: str = "JSONEachRow",
+        order_by: Optional[str] = None,
     ) -> None:
         try:
             self._configure_clickhouse_json_settings()
 
-            if source == "s3":
-                if not self.s3_client:
-                    self.connect_s3()
-                response = self.s3_client.get_object(
-                    Bucket=self.s3_bucket, Key=file_key
-                )
-                content = response["Body"].read().decode("utf-8")
-            else:
-                if not self.gcs_storage_client:
-                    self.connect_to_gcs()
-                bucket = self.gcs_storage_client.bucket(self.gcs_bucket)
-                blob = bucket.blob(file_key)
-                content = blob.download_as_text()
-
-            lines = content.strip().split("\n")
-            sample_data = []
-            for line in lines[:1000]:
-                if line.strip():
-                    try:
-                        parsed = json.loads(line)
-                        if isinstance(parsed, dict):
-                            sample_data.append(parsed)
-                        elif isinstance(parsed, list):
-                            sample_data.extend(
-                                [item for item in parsed if isinstance(item, dict)]
-                            )
-                    except json.JSONDecodeError:
-                        continue
-
-            if not sample_data:
-                raise ValueError("No valid sample data found for schema inference.")
+            if source != "s3":
+                raise ValueError(f"Unsupported source for {format} files: {source}")
 
-            schema = {}
-            all_columns = set()
-            for row in sample_data:
-                all_columns.update(row.keys())
-
-            for col in all_columns:
-                values = [
-                    row.get(col) for row in sample_data if row.get(col) is not None
-                ]
-                if not values:
-                    schema[col] = "Nullable(String)"
-                    continue
-
-                value_types = set()
-                for val in values[:100]:
-                    if isinstance(val, dict):
-                        value_types.add("object")
-                    elif isinstance(val, list):
-                        value_types.add("array")
-                    elif isinstance(val, str):
-                        value_types.add("string")
-                    elif isinstance(val, bool):
-                        value_types.add("bool")
-                    elif isinstance(val, int):
-                        value_types.add("int")
-                    elif isinstance(val, float):
-                        value_types.add("float")
-
-                if len(value_types) > 1:
-                    self.logger.warning(
-                        f"Column '{col}' has mixed types. Using String type."
-                    )
-                    schema[col] = "String"
-                    continue
-
-                datetime_count = 0
-                date_count = 0
-                for val in values[:20]:
-                    if isinstance(val, str):
-                        if re.match(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$", val):
-                            datetime_count += 1
-                        elif re.match(r"^\d{4}-\d{2}-\d{2}$", val):
-                            date_count += 1
-
-                total_checked = min(20, len(values))
-                if total_checked and datetime_count / total_checked > 0.8:
-                    schema[col] = "DateTime('UTC')"
-                elif total_checked and date_count / total_checked > 0.8:
-                    schema[col] = "Date"
-                else:
-                    sample = values[0]
-                    if isinstance(sample, bool):
-                        schema[col] = "Bool"
-                    elif isinstance(sample, int):
-                        schema[col] = "Int64"
-                    elif isinstance(sample, float):
-                        schema[col] = "Float64"
-                    elif isinstance(sample, (dict, list)):
-                        schema[col] = "String"
-                    else:
-                        schema[col] = "String"
-
-            if derived_column:
-                self.logger.info(f"Adding derived column '{derived_column}' to schema")
-                schema[derived_column] = "Date"
-
-            columns_ddl = [f"`{k}` {v}" for k, v in schema.items()]
-            ddl = f"""
-            CREATE TABLE {self.clickhouse_database}.{target_table} (
-                {', '.join(columns_ddl)}
-            )
-            ENGINE = MergeTree()
-            ORDER BY tuple()
-            """
+            schema = self._infer_schema_from_table_function(
+                self._create_s3_table_function(file_key, format)
+            )
 
-            self.clickhouse_client.command(ddl)
-            self.logger.info(
-                f"Successfully created table {target_table}"
-                + (
-                    f" (with derived column '{derived_column}')"
-                    if derived_column
-                    else ""
-                )
+            self._create_table_from_schema(
+                target_table, schema, derived_column=derived_column, order_by=order_by
             )
 
         except Exception as e:
             self.logger.error(f"Failed to create table from file {file_key}: {str(e)}")
             raise
 
+    def _create_table_from_schema(
+        self,
+        target_table: str,
+        schema: Dict[str, str],
+        derived_column: str = None,
+        order_by: Optional[str] = None,
+    ) -> None:
+        if derived_column:
+            self.logger.info(f"Adding derived column '{derived_column}' to schema")
+            schema[derived_column] = "Date"
+
+        engine, order_by = self._table_engine_ddl(schema, derived_column, order_by)
+
+        columns_ddl = ", ".join(f"{_q(k)} {v}" for k, v in schema.items())
+        ddl = f"""
+        CREATE TABLE {_q(self.clickhouse_database)}.{_q(target_table)} (
+            {columns_ddl}
+        )
+        ENGINE = {engine}
+        ORDER BY {order_by}
+        """
+
+        self.clickhouse_client.command(ddl)
+        self._schema_cache[target_table] = dict(schema)
+        self._table_engines[target_table] = engine.split("(")[0]
+        self.logger.info(
+            f"Successfully created table {target_table}"
+            + (f" (with derived column '{derived_column}')" if derived_column else "")
+        )
+
+    def _table_engine_ddl(
+        self,
+        schema: Dict[str, str],
+        derived_column: str = None,
+        order_by: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        """Pick ReplacingMergeTree when rows can be deduplicated on the upsert key.
+
+        Upserts then become plain inserts that merges collapse to the row with
+        the newest tracking value, so the upsert key is always the sorting key.
+        Other tables (snapshots included) keep every row in a MergeTree sorted
+        by ``order_by``, or by an inferred date/time column when not given.
+        """
+        key_type = schema.get(self.upsert_key)
+        version_type = schema.get(self.tracking_column)
+        if derived_column or not key_type or not version_type:
+            return "MergeTree()", self._sort_key(schema, order_by)
+
+        # Sorting and version columns cannot be Nullable
+        version_type = NULLABLE_TYPE.sub(r"\1", version_type)
+        if not REPLACING_VERSION_TYPE.match(version_type):
+            return "MergeTree()", self._sort_key(schema, order_by)
+
+        schema[self.upsert_key] = NULLABLE_TYPE.sub(r"\1", key_type)
+        schema[self.tracking_column] = version_type
+        return (
+            f"ReplacingMergeTree({_q(self.tracking_column)})",
+            f"({_q(self.upsert_key)})",
+        )
+
+    def _sort_key(self, schema: Dict[str, str], order_by: Optional[str] = None) -> str:
+        if order_by is None:
+            tracking_type = schema.get(self.tracking_column, "")
+            if REPLACING_VERSION_TYPE.match(NULLABLE_TYPE.sub(r"\1", tracking_type)):
+                order_by = self.tracking_column
+            else:
+                order_by = next(
+                    (
+                        column
+                        for column, column_type in schema.items()
+                        if DATETIME_TYPE.match(NULLABLE_TYPE.sub(r"\1", column_type))
+                    ),
+                    None,
+                )
+            if order_by is None:
+                return "tuple()"
+        elif order_by not in schema:
+            raise ValueError(f"order_by column '{order_by}' not found in schema")
+
+        # Sorting key columns cannot be Nullable
+        schema[order_by] = NULLABLE_TYPE.sub(r"\1", schema[order_by])
+        return f"({_q(order_by)})"
+
+    def _table_engine(self, table_name: str) -> str:
+        if table_name not in self._table_engines:
+            result = self.clickhouse_client.query(
+                """
+                SELECT engine FROM system.tables
+                WHERE database = {db:String} AND name = {tbl:String}
+                """,
+                parameters={"db": self.clickhouse_database, "tbl": table_name},
+            )
+            self._table_engines[table_name] = (
+                result.result_rows[0][0] if result.result_rows else ""
+            )
+        return self._table_engines[table_name]
+
+    def _arrow_schema_to_clickhouse(self, arrow_schema: pa.Schema) -> Dict[str, str]:
+        schema = {}
+        for field in arrow_schema:
+            arrow_type = field.type
+
+            if pa.types.is_boolean(arrow_type):
+                ch_type = "Bool"
+            elif pa.types.is_integer(arrow_type):
+                prefix = "Int" if pa.types.is_signed_integer(arrow_type) else "UInt"
+                ch_type = f"{prefix}{arrow_type.bit_width}"
+            elif pa.types.is_floating(arrow_type):
+                ch_type = f"Float{arrow_type.bit_width}"
+            elif pa.types.is_decimal(arrow_type):
+                ch_type = f"Decimal({arrow_type.precision}, {arrow_type.scale})"
+            elif pa.types.is_date(arrow_type):
+                ch_type = "Date32"
+            elif pa.types.is_timestamp(arrow_type):
+                ch_type = (
+                    f"DateTime64(6, '{arrow_type.tz}')"
+                    if arrow_type.tz
+                    else "DateTime64(6)"
+                )
+            else:
+                ch_type = "String"
+
+            schema[field.name] = f"Nullable({ch_type})" if field.nullable else ch_type
+
+        return schema
+
+    def _infer_schema_from_table_function(self, table_function: str) -> Dict[str, str]:
+        result = self.clickhouse_client.query(
+            f"DESCRIBE TABLE {table_function}",
+            settings={
+                "input_format_max_rows_to_read_for_schema_inference": SCHEMA_SAMPLE_ROWS,
+                "date_time_input_format": S3_READ_SETTINGS["date_time_input_format"],
+            },
+        )
+        return {row["name"]: row["type"] for row in result.named_results()}
+
     def _generate_create_table_ddl(
         self, table_name: str, schema: Dict[str, str]
     ) -> str:
-        columns_ddl = []
-        for column_name, column_type in schema.items():
-            columns_ddl.append(f"    `{column_name}` {column_type}")
-
-        columns_str = ",\n".join(columns_ddl)
+        order_by = self._sort_key(schema)
+        columns_str = ",\n".join(
+            f"    {_q(column_name)} {column_type}"
+            for column_name, column_type in schema.items()
+        )
 
         ddl = (
-            f"CREATE TABLE {self.clickhouse_database}.{table_name} (\n"
+            f"CREATE TABLE {_q(self.clickhouse_database)}.{_q(table_name)} (\n"
             f"{columns_str}\n"
             ") ENGINE = MergeTree()\n"
-            "ORDER BY tuple()"
+            f"ORDER BY {order_by}"
         )
 
         self.logger.info(f"Generated DDL: {ddl}")
@@ -0,0 +1,30 @@
+from functools import cache
+
+import pymongo
+from psycopg2.pool import ThreadedConnectionPool
+
+# Source clients are built once per process and server, then shared by every
+# loader talking to it; loaders leave them open instead of reconnecting.
+MONGO_MAX_POOL_SIZE = 50
+POSTGRES_MAX_CONNECTIONS = 8
+
+
+@cache
+def get_mongo_client(mongo_uri: str) -> pymongo.MongoClient:
+    return pymongo.MongoClient(mongo_uri, maxPoolSize=MONGO_MAX_POOL_SIZE)
+
+
+@cache
+def get_postgres_pool(
+    host: str, port: int, user: str, password: str, database: str
+) -> ThreadedConnectionPool:
+    # Loaders borrow one connection per call and hand it back when done
+    return ThreadedConnectionPool(
+        minconn=1,
+        maxconn=POSTGRES_MAX_CONNECTIONS,
+        host=host,
+        port=port,
+        user=user,
+        password=password,
+        database=database,
+    )
@@ -1,10 +1,25 @@
-from typing import Dict, List, Optional, Any, Generator, Set
+from typing import Dict, List, Optional, Any, Generator, Tuple
 import pymongo
 from bson.objectid import ObjectId
-from bson import json_util
+from bson import Int64, json_util
 from datetime import datetime
-import psutil
-from .base_loader import DataSourceLoader
+import math
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from pymongoarrow.api import Schema, find_arrow_all
+from pymongoarrow.types import ObjectIdType
+from .base_loader import AUTOTUNE_SAMPLE_ROWS, DataSourceLoader
+
+# Values json_util would emit unchanged (bson.Int64 subclasses int and is
+# written as a plain number too)
+JSON_NATIVE_TYPES = frozenset({int, bool, type(None), Int64})
+
+# find_arrow_all materialises its whole result, so Arrow extracts read the
+# collection in _id-ordered pages of this many documents
+ARROW_PAGE_DOCS = 100_000
+
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
 
 
 class MongoToClickhouseLoader(DataSourceLoader):
@@ -26,6 +41,11 @@ class MongoToClickhouseLoader(DataSourceLoader):
         tracking_column: str = "updated_at",
         upsert_key: str = "_id",
         batch_size: int = 10000,
+        staging_format: str = "json",
+        target_batch_bytes: Optional[int] = None,
+        mongo_client: Optional[pymongo.MongoClient] = None,
+        clickhouse_client=None,
+        s3_client=None,
     ):
         super().__init__(
             clickhouse_host=clickhouse_host,
@@ -40,14 +60,23 @@ class MongoToClickhouseLoader(DataSourceLoader):
             tracking_column=tracking_column,
             upsert_key=upsert_key,
             batch_size=batch_size,
+            staging_format=staging_format,
+            target_batch_bytes=target_batch_bytes,
+            clickhouse_client=clickhouse_client,
+            s3_client=s3_client,
         )
 
         self.mongo_uri = mongo_uri
         self.mongo_database = mongo_database
-        self.mongo_client = None
+        self.mongo_client = mongo_client
         self.mongo_db = None
+        self._owns_mongo_client = mongo_client is None
 
     def connect_source(self) -> None:
+        if not self._owns_mongo_client:
+            self.mongo_db = self.mongo_client[self.mongo_database]
+            return
+
         try:
             self.logger.info(
                 f"Connecting to MongoDB at {self.mongo_uri.split('@')[1].replace('/', '')}"
@@ -59,14 +88,42 @@ class MongoToClickhouseLoader(DataSourceLoader):
             self.logger.error(f"Failed to connect to MongoDB: {str(e)}")
             raise
 
+    def get_id_shard_bounds(
+        self, collection_name: str, num_shards: int
+    ) -> List[Tuple[Any, Optional[Any]]]:
+        if self.mongo_db is None:
+            self.connect_source()
+
+        try:
+            buckets = list(
+                self.mongo_db[collection_name].aggregate(
+                    [
+                        {"$project": {"_id": 1}},
+                        {"$bucketAuto": {"groupBy": "$_id", "buckets": num_shards}},
+                    ],
+                    # $bucketAuto sorts every _id; past the 100MB stage limit
+                    # it has to spill to disk instead of failing
+                    allowDiskUse=True,
+                )
+            )
+
+            lower_bounds = [bucket["_id"]["min"] for bucket in buckets]
+            bounds = list(zip(lower_bounds, lower_bounds[1:] + [None]))
+
+            self.logger.info(
+                f"Computed {len(bounds)} _id shard bounds for {collection_name}"
+            )
+            return bounds
+        except Exception as e:
+            self.logger.error(f"Failed to compute _id shard bounds: {str(e)}")
+            raise
+
     def _delete_fields_from_doc(
-        self, doc: Dict[str, Any], fields_to_delete: Set[str]
+        self, doc: Dict[str, Any], fields_to_delete: List[Tuple[str, ...]]
     ) -> Dict[str, Any]:
         result = doc.copy()
 
-        for field_path in fields_to_delete:
-            parts = field_path.split(".")
-
+        for parts in fields_to_delete:
             if len(parts) == 1:
                 if parts[0] in result:
                     del result[parts[0]]
@@ -88,45 +145,52 @@ class MongoToClickhouseLoader(DataSourceLoader):
         if fields_to_delete:
             doc = self._delete_fields_from_doc(doc, fields_to_delete)
 
-        doc = self._convert_objectid(doc)
-        doc = self._convert_datetime(doc)
-
         if flatten_nested:
-            doc = self._flatten_document(doc)
-
-        json_str = json_util.dumps(doc)
-        json_str = json_str.replace("$", "")
-
-        return json_util.loads(json_str)
-
-    def _convert_objectid(self, obj):
-        if isinstance(obj, ObjectId):
-            return str(obj)
-        elif isinstance(obj, dict):
-            return {k: self._convert_objectid(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_objectid(item) for item in obj]
-        else:
+            return self._flatten_to_json(doc)
+
+        return self._to_json_value(doc)
+
+    def _to_json_value(self, obj):
+        # One walk converts ObjectIds and datetimes and strips "$" from keys and
+        # strings
+        obj_type = type(obj)
+        if obj_type is str:
+            return obj.replace("$", "")
+        elif obj_type is dict:
+            to_json_value = self._to_json_value
+            return {k.replace("$", ""): to_json_value(v) for k, v in obj.items()}
+        elif obj_type is list:
+            return [self._to_json_value(item) for item in obj]
+        elif obj_type in JSON_NATIVE_TYPES:
             return obj
-
-    def _convert_datetime(self, obj):
-        if isinstance(obj, datetime):
+        elif obj_type is ObjectId:
+            return str(obj)
+        elif obj_type is datetime:
             return obj.strftime("%Y-%m-%d %H:%M:%S")
-        elif isinstance(obj, dict):
-            return {k: self._convert_datetime(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._convert_datetime(item) for item in obj]
+        elif obj_type is float:
+            if math.isfinite(obj):
+                return obj
+            # NaN/Infinity have no JSON literal; keep json_util's numberDouble form
+            return json_util.loads(json_util.dumps(obj).replace("$", ""))
         else:
-            return obj
-
-    def _flatten_document(self, doc):
+            # Other BSON types map to their extended-JSON form ({"$numberDecimal":
+            # ...}), whose "$" keys the walk strips without a dumps/loads trip
+            return self._to_json_value(json_util.default(obj))
+
+    def _flatten_to_json(self, doc):
+        # Flattens one level of nesting in the same walk that converts values,
+        # rather than building an intermediate flattened copy first
+        to_json_value = self._to_json_value
         flattened = {}
         for key, value in doc.items():
+            key = key.replace("$", "")
             if isinstance(value, dict):
-                for nested_key, nested_value in value.items():
-                    flattened[f"{key}_{nested_key}"] = nested_value
+                flattened |= {
+                    f"{key}_{nested_key.replace('$', '')}": to_json_value(nested_value)
+                    for nested_key, nested_value in value.items()
+                }
             else:
-                flattened[key] = value
+                flattened[key] = to_json_value(value)
         return flattened
 
     def extract_data(
@@ -136,7 +200,6 @@ class MongoToClickhouseLoader(DataSourceLoader):
         source_schema: Optional[str] = None,
         **kwargs,
     ) -> Generator[Dict[str, Any], None, None]:
-        query_filter = kwargs.get("query_filter")
         projection = kwargs.get("projection")
         fields_to_delete = kwargs.get("fields_to_delete")
         flatten_nested = kwargs.get("flatten_nested", False)
@@ -147,78 +210,117 @@ class MongoToClickhouseLoader(DataSourceLoader):
         try:
             collection = self.mongo_db[collection_name]
 
-            query = query_filter.copy() if query_filter else {}
-
-            if last_value is not None:
-                try:
-                    iso_string = last_value.isoformat()
-                    last_datetime = datetime.fromisoformat(iso_string)
-                    query[self.tracking_column] = {"$gte": last_datetime}
-                except ValueError:
-                    query[self.tracking_column] = {"$gte": last_value}
+            query = self._build_query(
+                last_value, kwargs.get("query_filter"), kwargs.get("id_range")
+            )
 
-            total_count = collection.count_documents(query)
+            # Only the log line uses the total, so avoid a second scan for it;
+            # the collection metadata count is exact when nothing is filtered
+            total_count = collection.estimated_document_count() if not query else "?"
             self.logger.info(
                 f"Query will return approximately {total_count} documents from {collection_name}"
             )
 
             self.logger.info(f"Executing query on {collection_name}")
-            cursor = collection.find(query, projection=projection).sort(
-                [(self.tracking_column, pymongo.ASCENDING)]
+            # The driver already fetches in batch_size getMore round trips
+            cursor = (
+                collection.find(
+                    query, projection=projection, hint=self._index_hint(query)
+                )
+                .batch_size(self.batch_size)
+                .sort([(self.tracking_column, pymongo.ASCENDING)])
             )
 
-            fields_to_delete_set = set(fields_to_delete) if fields_to_delete else None
+            # Split the dotted paths once rather than for every document
+            compiled_paths = (
+                [tuple(path.split(".")) for path in set(fields_to_delete)]
+                if fields_to_delete
+                else None
+            )
 
             batch_size = self.batch_size
-            batch_num = 0
             total_docs = 0
-            current_batch = []
 
             for doc in cursor:
-                current_batch.append(doc)
-
-                if len(current_batch) >= batch_size:
-                    batch_num += 1
-                    total_docs += len(current_batch)
+                yield self._process_mongo_document(
+                    doc,
+                    fields_to_delete=compiled_paths,
+                    flatten_nested=flatten_nested,
+                )
+                total_docs += 1
 
+                if total_docs % batch_size == 0:
                     self.logger.info(
-                        f"Processing batch {batch_num} ({total_docs}/{total_count} docs)"
+                        f"Processing batch {total_docs // batch_size} "
+                        f"({total_docs}/{total_count} docs)"
                     )
+                    self._log_memory_usage(total_docs // batch_size)
 
-                    for doc in current_batch:
-                        processed_doc = self._process_mongo_document(
-                            doc,
-                            fields_to_delete=fields_to_delete_set,
-                            flatten_nested=flatten_nested,
-                        )
-                        yield processed_doc
-
-                    try:
-                        process = psutil.Process()
-                        memory_info = process.memory_info()
-                        self.logger.info(
-                            f"Memory usage: {memory_info.rss / (1024 * 1024):.2f} MB"
-                        )
-                    except Exception as e:
-                        self.logger.warning(f"Failed to get memory usage: {str(e)}")
-
-                    current_batch = []
-
-            if current_batch:
-                batch_num += 1
-                total_docs += len(current_batch)
-
-                self.logger.info(
-                    f"Processing final batch {batch_num} ({total_docs} docs total)"
+            self.logger.info(
+                f"Finished extracting {total_docs} documents from {collection_name}"
+            )
+
+        except Exception as e:
+            self.logger.error(f"Failed to extract data from MongoDB: {str(e)}")
+            raise
+
+    def extract_record_batches(
+        self,
+        collection_name: str,
+        last_value: Optional[str] = None,
+        source_schema: Optional[str] = None,
+        **kwargs,
+    ) -> Generator[pa.RecordBatch, None, None]:
+        # Field deletion and flattening are per-document transforms
+        if kwargs.get("fields_to_delete") or kwargs.get("flatten_nested"):
+            yield from super().extract_record_batches(
+                collection_name, last_value, source_schema, **kwargs
+            )
+            return
+
+        arrow_schema = kwargs.get("arrow_schema")
+
+        if self.mongo_db is None:
+            self.connect_source()
+
+        try:
+            collection = self.mongo_db[collection_name]
+
+            query = self._build_query(
+                last_value, kwargs.get("query_filter"), kwargs.get("id_range")
+            )
+
+            schema = Schema(arrow_schema) if arrow_schema else None
+            hint = self._index_hint(query)
+
+            self.logger.info(f"Executing Arrow query on {collection_name}")
+            page_query = query
+            total_docs = 0
+            while True:
+                table = find_arrow_all(
+                    collection,
+                    page_query,
+                    schema=schema,
+                    projection=kwargs.get("projection"),
+                    sort=[("_id", pymongo.ASCENDING)],
+                    limit=ARROW_PAGE_DOCS,
+                    hint=hint,
                 )
+                table = self._stringify_object_ids(table)
+                if total_docs == 0:
+                    self._autotune_batch_size(table.slice(0, AUTOTUNE_SAMPLE_ROWS))
+                total_docs += table.num_rows
+
+                yield from table.to_batches(max_chunksize=self.batch_size)
 
-                for doc in current_batch:
-                    processed_doc = self._process_mongo_document(
-                        doc,
-                        fields_to_delete=fields_to_delete_set,
-                        flatten_nested=flatten_nested,
+                if table.num_rows < ARROW_PAGE_DOCS:
+                    break
+                if "_id" not in table.column_names:
+                    raise ValueError(
+                        "Arrow extracts page on _id; keep it in the projection "
+                        "and arrow_schema"
                     )
-                    yield processed_doc
+                page_query = self._after_id(query, table.column("_id")[-1].as_py())
 
             self.logger.info(
                 f"Finished extracting {total_docs} documents from {collection_name}"
@@ -228,9 +330,95 @@ class MongoToClickhouseLoader(DataSourceLoader):
             self.logger.error(f"Failed to extract data from MongoDB: {str(e)}")
             raise
 
+    def _build_query(
+        self,
+        last_value: Optional[Any] = None,
+        query_filter: Optional[Dict[str, Any]] = None,
+        id_range: Optional[Tuple[Any, Optional[Any]]] = None,
+    ) -> Dict[str, Any]:
+        query = query_filter.copy() if query_filter else {}
+
+        if last_value is not None:
+            if self.tracking_column == "_id":
+                # ClickHouse hands back ObjectIds as hex strings; compare as
+                # ObjectId so the _id index serves the range
+                if isinstance(last_value, str) and ObjectId.is_valid(last_value):
+                    last_value = ObjectId(last_value)
+                query["_id"] = {"$gt": last_value}
+            elif isinstance(last_value, datetime):
+                query[self.tracking_column] = {"$gte": last_value}
+            else:
+                try:
+                    last_datetime = datetime.fromisoformat(str(last_value))
+                    query[self.tracking_column] = {"$gte": last_datetime}
+                except ValueError:
+                    query[self.tracking_column] = {"$gte": last_value}
+
+        if id_range is not None:
+            lo, hi = id_range
+            id_filter = dict(query.get("_id", {}))
+            id_filter["$gte"] = lo
+            if hi is not None:
+                id_filter["$lt"] = hi
+            query["_id"] = id_filter
+
+        return query
+
+    def _after_id(self, query: Dict[str, Any], last_id: Any) -> Dict[str, Any]:
+        # Pages come back as hex strings; compare as ObjectId like _build_query
+        if isinstance(last_id, str) and ObjectId.is_valid(last_id):
+            last_id = ObjectId(last_id)
+        id_filter = dict(query.get("_id", {}))
+        id_filter["$gt"] = last_id
+        return {**query, "_id": id_filter}
+
+    def _index_hint(self, query: Dict[str, Any]) -> Optional[List[Tuple[str, int]]]:
+        # Only an _id watermark is known to be served by the _id index. A shard
+        # range on top of an updated_at filter is left to the planner, which
+        # can pick the tracking column's index (if the collection has one)
+        # instead of walking the whole shard
+        if self.tracking_column == "_id" and "_id" in query:
+            return [("_id", pymongo.ASCENDING)]
+        return None
+
+    def _stringify_object_ids(self, table: pa.Table) -> pa.Table:
+        # Keep ObjectIds as hex strings, matching the JSON staging path
+        for i, field in enumerate(table.schema):
+            if isinstance(field.type, ObjectIdType):
+                chunks = [
+                    self._object_ids_to_hex(chunk.storage)
+                    for chunk in table.column(i).chunks
+                ]
+                table = table.set_column(
+                    i,
+                    pa.field(field.name, pa.string()),
+                    pa.chunked_array(chunks, pa.string()),
+                )
+        return table
+
+    def _object_ids_to_hex(self, ids: pa.FixedSizeBinaryArray) -> pa.StringArray:
+        # Encodes the 12-byte values as 24 hex digits in numpy rather than
+        # building an ObjectId per row
+        if len(ids) == 0:
+            return pa.array([], pa.string())
+
+        raw = np.frombuffer(ids.buffers()[1], dtype=np.uint8)
+        raw = raw[ids.offset * 12 : (ids.offset + len(ids)) * 12].reshape(-1, 12)
+        digits = np.empty((len(ids), 24), dtype=np.uint8)
+        digits[:, 0::2] = HEX_DIGITS[raw >> 4]
+        digits[:, 1::2] = HEX_DIGITS[raw & 0x0F]
+        offsets = np.arange(0, digits.size + 1, 24, dtype=np.int32)
+
+        hex_ids = pa.StringArray.from_buffers(
+            len(ids), pa.py_buffer(offsets), pa.py_buffer(digits)
+        )
+        if ids.null_count:
+            hex_ids = pc.if_else(ids.is_valid(), hex_ids, None)
+        return hex_ids
+
     def close_connections(self) -> None:
         super().close_connections()
-        if self.mongo_client:
+        if self.mongo_client and self._owns_mongo_client:
             try:
                 self.mongo_client.close()
                 self.logger.info("Closed MongoDB connection")
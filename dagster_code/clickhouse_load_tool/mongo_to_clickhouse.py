@@ -1,5 +1,6 @@
 from typing import Dict, Any, List, Optional
-from .clickhouse_load_tool.mongo_loader import MongoToClickhouseLoader
+from .connections import get_mongo_client
+from .mongo_loader import MongoToClickhouseLoader
 
 
 def create_loader(config: Dict[str, Any]) -> MongoToClickhouseLoader:
@@ -18,6 +19,7 @@ def create_loader(config: Dict[str, Any]) -> MongoToClickhouseLoader:
         tracking_column=config.get("tracking_column", "updated_at"),
         upsert_key=config.get("upsert_key", "_id"),
         batch_size=int(config.get("batch_size", 10000)),
+        mongo_client=get_mongo_client(config.get("mongo_uri")),
     )
 
 
@@ -1,11 +1,69 @@
-from typing import Dict, Optional, Any, Generator
+from typing import Callable, Dict, List, Optional, Any, Generator, Tuple
+import gzip
+import os
+import threading
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.pool import AbstractConnectionPool
 from datetime import datetime, date
-import psutil
 from decimal import Decimal
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 
-from .base_loader import DataSourceLoader
+from .base_loader import STAGING_GZIP_LEVEL, DataSourceLoader, S3MultipartWriter
+
+# PostgreSQL type OID -> Arrow type; anything not listed is staged as a string
+ARROW_TYPES_BY_OID = {
+    16: pa.bool_(),
+    20: pa.int64(),
+    21: pa.int16(),
+    23: pa.int32(),
+    700: pa.float32(),
+    701: pa.float64(),
+    1700: pa.float64(),
+    1082: pa.date32(),
+    1114: pa.timestamp("us"),
+    1184: pa.timestamp("us", tz="UTC"),
+}
+
+COPY_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+def _convert_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    elif isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    elif isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _format_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _format_date(value: date) -> str:
+    return value.strftime("%Y-%m-%d")
+
+
+# PostgreSQL type OID -> converter for non-NULL values of that column; None
+# marks types psycopg2 already returns as JSON-ready Python values
+PYTHON_CONVERTERS_BY_OID = {
+    16: None,
+    20: None,
+    21: None,
+    23: None,
+    25: None,
+    700: None,
+    701: None,
+    1042: None,
+    1043: None,
+    2950: None,
+    1700: float,
+    1082: _format_date,
+    1114: _format_datetime,
+    1184: _format_datetime,
+}
 
 
 class PostgresToClickhouseLoader(DataSourceLoader):
@@ -30,6 +88,11 @@ class PostgresToClickhouseLoader(DataSourceLoader):
         tracking_column: str = "updated_at",
         upsert_key: str = "id",
         batch_size: int = 10000,
+        staging_format: str = "json",
+        target_batch_bytes: Optional[int] = None,
+        postgres_pool: Optional[AbstractConnectionPool] = None,
+        clickhouse_client=None,
+        s3_client=None,
     ):
         super().__init__(
             clickhouse_host=clickhouse_host,
@@ -44,6 +107,10 @@ class PostgresToClickhouseLoader(DataSourceLoader):
             tracking_column=tracking_column,
             upsert_key=upsert_key,
             batch_size=batch_size,
+            staging_format=staging_format,
+            target_batch_bytes=target_batch_bytes,
+            clickhouse_client=clickhouse_client,
+            s3_client=s3_client,
         )
 
         self.postgres_host = postgres_host
@@ -52,8 +119,15 @@ class PostgresToClickhouseLoader(DataSourceLoader):
         self.postgres_password = postgres_password
         self.postgres_database = postgres_database
         self.postgres_conn = None
+        self.postgres_pool = postgres_pool
 
     def connect_source(self) -> None:
+        if self.postgres_pool is not None:
+            # Hold one pooled connection until close_connections() returns it
+            if self.postgres_conn is None:
+                self.postgres_conn = self.postgres_pool.getconn()
+            return
+
         try:
             self.logger.info(
                 f"Connecting to PostgreSQL at {self.postgres_host}:{self.postgres_port}"
@@ -92,15 +166,10 @@ class PostgresToClickhouseLoader(DataSourceLoader):
                 total_count = cursor.fetchone()[0]
                 self.logger.info(f"Query will return approximately {total_count} rows")
 
-            with self.postgres_conn.cursor(
-                name="large_result_cursor", cursor_factory=RealDictCursor
-            ) as cursor:
-                query = f"SELECT * FROM {source_schema}.{table_name}"
-                params = []
-
-                if last_value is not None:
-                    query += f" WHERE {self.tracking_column} > %s"
-                    params.append(last_value)
+            with self.postgres_conn.cursor(name="large_result_cursor") as cursor:
+                query, params = self._build_select_query(
+                    table_name, last_value, source_schema
+                )
 
                 self.logger.info(f"Executing query on {source_schema}.{table_name}")
                 cursor.execute(query, params)
@@ -109,6 +178,8 @@ class PostgresToClickhouseLoader(DataSourceLoader):
                 batch_size = self.batch_size
                 batch_num = 0
                 total_rows = 0
+                column_names = None
+                conversions = None
 
                 while True:
                     batch = cursor.fetchmany(batch_size)
@@ -117,6 +188,13 @@ class PostgresToClickhouseLoader(DataSourceLoader):
                         self.logger.info(f"Finished extracting {total_rows} rows total")
                         break
 
+                    if column_names is None:
+                        # Resolve each column's conversion once from its type OID
+                        # instead of type-checking every value
+                        column_names, conversions = self._row_conversions(
+                            cursor.description
+                        )
+
                     batch_num += 1
                     batch_row_count = len(batch)
                     total_rows += batch_row_count
@@ -126,36 +204,238 @@ class PostgresToClickhouseLoader(DataSourceLoader):
                     )
 
                     for row in batch:
-                        processed_row = {}
-                        for key, value in dict(row).items():
-                            if isinstance(value, datetime):
-                                processed_row[key] = value.strftime("%Y-%m-%d %H:%M:%S")
-                            elif isinstance(value, date):
-                                processed_row[key] = value.strftime("%Y-%m-%d")
-                            elif isinstance(value, Decimal):
-                                processed_row[key] = float(value)
-                            else:
-                                processed_row[key] = value
+                        processed_row = dict(zip(column_names, row))
+                        for i, name, convert in conversions:
+                            value = row[i]
+                            if value is not None:
+                                processed_row[name] = convert(value)
 
                         yield processed_row
 
+                    self._log_memory_usage(batch_num)
+
+        except Exception as e:
+            self.logger.error(f"Failed to extract data from PostgreSQL: {str(e)}")
+            raise
+
+    def extract_record_batches(
+        self,
+        table_name: str,
+        last_value: Optional[str] = None,
+        source_schema: str = "public",
+        tracking_range: Optional[Tuple[Any, Any]] = None,
+        **kwargs,
+    ) -> Generator[pa.RecordBatch, None, None]:
+        if not self.postgres_conn:
+            self.connect_source()
+
+        try:
+            query, params = self._build_select_query(
+                table_name, last_value, source_schema, tracking_range
+            )
+
+            with self.postgres_conn.cursor() as cursor:
+                # Render timestamptz values with a "+00" offset Arrow can parse
+                cursor.execute("SET TIME ZONE 'UTC'")
+
+                cursor.execute(f"{query} LIMIT 0", params)
+                schema = self._arrow_schema(cursor.description)
+
+                copy_query = cursor.mogrify(
+                    f"COPY ({query}) TO STDOUT WITH (FORMAT csv)", params
+                ).decode()
+
+                # COPY writes into one end of a pipe from its own thread while
+                # Arrow parses the other end, so batches are yielded as the
+                # rows arrive rather than after the whole delta is out
+                read_fd, write_fd = os.pipe()
+                stopped = threading.Event()
+                errors = []
+
+                def copy_out() -> None:
+                    try:
+                        with os.fdopen(write_fd, "wb") as pipe_writer:
+                            cursor.copy_expert(copy_query, pipe_writer)
+                    except BaseException as e:
+                        if not stopped.is_set():
+                            self.logger.error(f"COPY out of PostgreSQL failed: {e}")
+                        errors.append(e)
+
+                self.logger.info(
+                    f"Copying {source_schema}.{table_name} out of PostgreSQL"
+                )
+                producer = threading.Thread(target=copy_out, daemon=True)
+                with os.fdopen(read_fd, "rb") as pipe_reader:
+                    producer.start()
+                    batch_num = 0
+                    total_rows = 0
+                    drained = False
                     try:
-                        process = psutil.Process()
-                        memory_info = process.memory_info()
-                        self.logger.info(
-                            f"Memory usage: {memory_info.rss / (1024 * 1024):.2f} MB"
+                        # Arrow rejects an empty CSV stream; an empty delta
+                        # simply yields no batches
+                        reader = (
+                            self._open_copy_csv(pipe_reader, schema)
+                            if pipe_reader.peek(1)
+                            else ()
                         )
-                    except Exception as e:
-                        self.logger.warning(f"Memory check failed: {str(e)}")
+                        for batch in reader:
+                            batch_num += 1
+                            total_rows += batch.num_rows
+                            self.logger.info(
+                                f"Processing batch {batch_num} ({total_rows} rows so far)"
+                            )
+                            yield batch
+                        drained = True
+                    finally:
+                        # If we stopped reading early, cancel the COPY so the
+                        # connection goes back to its pool in a clean state
+                        if not drained and producer.is_alive():
+                            stopped.set()
+                            self.postgres_conn.cancel()
+                        pipe_reader.close()
+                        producer.join()
+
+                # A failed COPY ends the stream early; don't pass it off as complete
+                if errors:
+                    raise errors[0]
+
+                self.logger.info(f"Finished extracting {total_rows} rows total")
 
         except Exception as e:
             self.logger.error(f"Failed to extract data from PostgreSQL: {str(e)}")
             raise
 
+    def copy_to_s3(
+        self,
+        table_name: str,
+        s3_key: str,
+        last_value: Optional[str] = None,
+        source_schema: str = "public",
+        tracking_range: Optional[Tuple[Any, Any]] = None,
+        **kwargs,
+    ) -> Optional[str]:
+        if not self.postgres_conn:
+            self.connect_source()
+
+        if not self.s3_client:
+            self.connect_s3()
+
+        try:
+            query, params = self._build_select_query(
+                table_name, last_value, source_schema, tracking_range
+            )
+
+            with self.postgres_conn.cursor() as cursor:
+                cursor.execute("SET TIME ZONE 'UTC'")
+                copy_query = cursor.mogrify(
+                    f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", params
+                ).decode()
+
+                self.logger.info(
+                    f"Copying {source_schema}.{table_name} to "
+                    f"s3://{self.s3_bucket}/{s3_key}"
+                )
+                # COPY output is compressed and shipped in parts as it streams;
+                # rows never pass through Python objects
+                writer = S3MultipartWriter(self.s3_client, self.s3_bucket, s3_key)
+                try:
+                    with gzip.GzipFile(
+                        fileobj=writer, mode="wb", compresslevel=STAGING_GZIP_LEVEL
+                    ) as gzip_file:
+                        cursor.copy_expert(copy_query, gzip_file)
+                    row_count = cursor.rowcount
+                except Exception:
+                    writer.abort()
+                    raise
+
+                if row_count == 0:
+                    writer.abort()
+                    return None
+
+                writer.close()
+
+            self.logger.info(f"Finished extracting {row_count} rows total")
+            return s3_key
+
+        except Exception as e:
+            self.logger.error(f"Failed to copy data from PostgreSQL: {str(e)}")
+            raise
+
+    def _build_select_query(
+        self,
+        table_name: str,
+        last_value: Optional[str] = None,
+        source_schema: str = "public",
+        tracking_range: Optional[Tuple[Any, Any]] = None,
+    ) -> Tuple[str, List[Any]]:
+        query = f"SELECT * FROM {source_schema}.{table_name}"
+        conditions = []
+        params = []
+
+        if last_value is not None:
+            conditions.append(f"{self.tracking_column} > %s")
+            params.append(last_value)
+
+        if tracking_range is not None:
+            conditions.append(
+                f"{self.tracking_column} >= %s AND {self.tracking_column} < %s"
+            )
+            params.extend(tracking_range)
+
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        return query, params
+
+    def _row_conversions(
+        self, description
+    ) -> Tuple[List[str], List[Tuple[int, str, Callable[[Any], Any]]]]:
+        column_names = [column.name for column in description]
+        conversions = []
+        for i, column in enumerate(description):
+            convert = PYTHON_CONVERTERS_BY_OID.get(column.type_code, _convert_value)
+            if convert is not None:
+                conversions.append((i, column.name, convert))
+        return column_names, conversions
+
+    def _open_copy_csv(self, stream, schema: pa.Schema) -> pa_csv.CSVStreamingReader:
+        return pa_csv.open_csv(
+            stream,
+            read_options=pa_csv.ReadOptions(
+                column_names=schema.names,
+                block_size=self.target_batch_bytes or COPY_BLOCK_SIZE,
+            ),
+            # COPY quotes text with embedded newlines; without this a row that
+            # straddles a block boundary is split into two malformed rows. A
+            # single row still has to fit in one block (arrow raises otherwise)
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=schema,
+                null_values=[""],
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=False,
+                true_values=["t"],
+                false_values=["f"],
+            ),
+        )
+
+    def _arrow_schema(self, description) -> pa.Schema:
+        return pa.schema(
+            [
+                pa.field(
+                    column.name, ARROW_TYPES_BY_OID.get(column.type_code, pa.string())
+                )
+                for column in description
+            ]
+        )
+
     def close_connections(self) -> None:
         super().close_connections()
 
-        if self.postgres_conn:
+        if self.postgres_conn and self.postgres_pool is not None:
+            self.postgres_pool.putconn(self.postgres_conn)
+            self.postgres_conn = None
+        elif self.postgres_conn:
             try:
                 self.postgres_conn.close()
                 self.logger.info("Closed PostgreSQL connection")
@@ -1,5 +1,6 @@
 from typing import Dict, Any
-from .clickhouse_load_tool.postgres_loader import PostgresToClickhouseLoader
+from .connections import get_postgres_pool
+from .postgres_loader import PostgresToClickhouseLoader
 
 
 def create_loader(config: Dict[str, Any]) -> PostgresToClickhouseLoader:
@@ -21,6 +22,13 @@ def create_loader(config: Dict[str, Any]) -> PostgresToClickhouseLoader:
         tracking_column=config.get("tracking_column", "updated_at"),
         upsert_key=config.get("upsert_key", "id"),
         batch_size=int(config.get("batch_size", 10000)),
+        postgres_pool=get_postgres_pool(
+            config.get("postgres_host"),
+            int(config.get("postgres_port")),
+            config.get("postgres_user"),
+            config.get("postgres_password"),
+            config.get("postgres_db"),
+        ),
     )
 
 
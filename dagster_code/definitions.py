@@ -7,6 +7,7 @@ from .jobs.all_jobs import (
     users_extraction_job,
     savings_plans_extraction_job,
     savings_transactions_extraction_job,
+    extraction_job,
 )
 from .schedules.all_schedules import (
     transactions_daily_schedule,
@@ -17,6 +18,12 @@ from .schedules.all_schedules import (
     raw_savings_transactions_extraction_schedule,
 )
 from .resources.dbt_resources import dbt
+from .resources.clients import (
+    mongo_resource,
+    postgres_resource,
+    clickhouse_resource,
+    s3_resource,
+)
 
 all_assets = load_assets_from_modules([assets])
 
@@ -29,6 +36,7 @@ defs = Definitions(
         users_extraction_job,
         savings_plans_extraction_job,
         savings_transactions_extraction_job,
+        extraction_job,
     ],
     schedules=[
         transactions_daily_schedule,
@@ -40,5 +48,9 @@ defs = Definitions(
     ],
     resources={
         "dbt": dbt,
+        "mongo": mongo_resource,
+        "postgres": postgres_resource,
+        "clickhouse": clickhouse_resource,
+        "s3": s3_resource,
     },
 )
@@ -1,12 +1,18 @@
-from dagster import define_asset_job, AssetSelection
+from dagster import define_asset_job, multiprocess_executor, AssetSelection
 from dagster_dbt import build_dbt_asset_selection
 from ..assets.dbt_assets import dbt_models
 from ..assets.extract_assets import raw_users, raw_plans, raw_savings_transactions
 
+# Extract-load steps (and the raw_users _id shards) are independent I/O-bound
+# work, so jobs with more than one of them run up to three side by side; the
+# dagster/concurrency_key op tag caps them across concurrent runs as well
+extract_executor = multiprocess_executor.configured({"max_concurrent": 3})
+
 users_extraction_job = define_asset_job(
     name="users_extraction_job",
     selection=AssetSelection.assets(raw_users),
     description="Extracts raw users data",
+    executor_def=extract_executor,
 )
 
 savings_plans_extraction_job = define_asset_job(
@@ -21,6 +27,15 @@ savings_transactions_extraction_job = define_asset_job(
     description="Extracts raw savings transactions",
 )
 
+# raw_savings_transactions is day-partitioned and can't share a run with the
+# unpartitioned snapshots; it is parallelised by running partitions as runs
+extraction_job = define_asset_job(
+    name="extraction_job",
+    selection=AssetSelection.assets(raw_users, raw_plans),
+    description="Extracts raw users and savings plans data side by side",
+    executor_def=extract_executor,
+)
+
 transactions_job = define_asset_job(
     name="transactions_job",
     selection=build_dbt_asset_selection(
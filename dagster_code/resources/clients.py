@@ -0,0 +1,69 @@
+from functools import cache
+
+import boto3
+import clickhouse_connect
+import pymongo
+from clickhouse_connect.driver.httputil import get_pool_manager
+from dagster import resource
+from psycopg2.pool import ThreadedConnectionPool
+
+from ..clickhouse_load_tool.base_loader import CLICKHOUSE_CLIENT_OPTIONS
+from ..clickhouse_load_tool.connections import get_mongo_client, get_postgres_pool
+from .config import CLICKHOUSE_CONFIG, MINIO_CONFIG, MONGO_CONFIG, POSTGRES_CONFIG
+
+# Clients are built once per step process and reused by every op running in it;
+# the loaders leave them open instead of reconnecting on each call. Source
+# pools share their sizing with the clickhouse_load_tool entry points.
+CLICKHOUSE_MAX_CONNECTIONS = 16
+
+
+@cache
+def get_clickhouse_client():
+    return clickhouse_connect.get_client(
+        host=CLICKHOUSE_CONFIG["clickhouse_host"],
+        port=CLICKHOUSE_CONFIG["clickhouse_port"],
+        username=CLICKHOUSE_CONFIG["clickhouse_user"],
+        password=CLICKHOUSE_CONFIG["clickhouse_password"],
+        database=CLICKHOUSE_CONFIG["clickhouse_database"],
+        pool_mgr=get_pool_manager(maxsize=CLICKHOUSE_MAX_CONNECTIONS),
+        **CLICKHOUSE_CLIENT_OPTIONS,
+    )
+
+
+@cache
+def get_s3_client():
+    s3_kwargs = {
+        "aws_access_key_id": MINIO_CONFIG["s3_access_key"],
+        "aws_secret_access_key": MINIO_CONFIG["s3_secret_key"],
+    }
+
+    if MINIO_CONFIG["s3_endpoint"]:
+        s3_kwargs["endpoint_url"] = MINIO_CONFIG["s3_endpoint"]
+
+    return boto3.client("s3", **s3_kwargs)
+
+
+@resource(description="Pooled MongoDB client shared by the extract ops")
+def mongo_resource(_init_context) -> pymongo.MongoClient:
+    return get_mongo_client(MONGO_CONFIG["mongo_uri"])
+
+
+@resource(description="PostgreSQL connection pool shared by the extract assets")
+def postgres_resource(_init_context) -> ThreadedConnectionPool:
+    return get_postgres_pool(
+        POSTGRES_CONFIG["postgres_host"],
+        POSTGRES_CONFIG["postgres_port"],
+        POSTGRES_CONFIG["postgres_user"],
+        POSTGRES_CONFIG["postgres_password"],
+        POSTGRES_CONFIG["postgres_database"],
+    )
+
+
+@resource(description="ClickHouse client shared by the extract and load steps")
+def clickhouse_resource(_init_context):
+    return get_clickhouse_client()
+
+
+@resource(description="S3 (MinIO) client used for staging files")
+def s3_resource(_init_context):
+    return get_s3_client()
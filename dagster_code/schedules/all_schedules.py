@@ -1,4 +1,5 @@
-from dagster import ScheduleDefinition
+from datetime import timedelta
+from dagster import RunRequest, ScheduleDefinition, schedule
 from ..jobs.all_jobs import (
     transactions_job,
     savings_plan_job,
@@ -7,7 +8,7 @@ from ..jobs.all_jobs import (
     savings_plans_extraction_job,
     savings_transactions_extraction_job,
 )
-
+from ..assets.extract_assets import SAVINGS_TRANSACTIONS_PARTITIONS
 
 raw_users_daily_extraction_schedule = ScheduleDefinition(
     job=users_extraction_job,
@@ -37,12 +38,28 @@ savings_plan_daily_schedule = ScheduleDefinition(
     description="Runs savings_plan mart daily at 5 minutes past every 3rd hour starting from 7am Lagos time",
 )
 
-raw_savings_transactions_extraction_schedule = ScheduleDefinition(
+
+@schedule(
     job=savings_transactions_extraction_job,
     cron_schedule="5 * * * *",
     execution_timezone="Africa/Lagos",
-    description="Runs transactions mart every 4 minutes Lagos time",
+    description="Refreshes the current raw_savings_transactions day partition every hour (and the previous day on the first run after midnight UTC)",
 )
+def raw_savings_transactions_extraction_schedule(context):
+    scheduled_time = context.scheduled_execution_time
+    partition_keys = {
+        SAVINGS_TRANSACTIONS_PARTITIONS.get_partition_key_for_timestamp(
+            run_time.timestamp()
+        )
+        for run_time in (scheduled_time - timedelta(hours=1), scheduled_time)
+    }
+
+    for partition_key in sorted(partition_keys):
+        yield RunRequest(
+            run_key=f"{partition_key}_{scheduled_time.isoformat()}",
+            partition_key=partition_key,
+        )
+
 
 transactions_daily_schedule = ScheduleDefinition(
     job=transactions_job,
@@ -0,0 +1,35 @@
+"""Uniform, cached element sampling for Faker in the data scripts.
+
+Faker's ``random_element`` builds cumulative weights from a provider's
+OrderedDict on every call, which dominates ``first_name()``/``last_name()``
+when generating users in bulk. The seed data has no need for the weighted
+distribution, so ``install()`` swaps in a plain choice over cached keys.
+Call it before creating the ``Faker`` instance, which binds provider methods
+when it is built.
+"""
+from faker.providers import BaseProvider
+
+_original_random_element = BaseProvider.random_element
+_keys_cache = {}
+
+
+def _fast_random_element(self, elements=("a", "b", "c")):
+    if hasattr(elements, "keys"):
+        # Weighted choices are provider attributes that live as long as the
+        # process; keep a reference so a reused id can't match another dict
+        cached = _keys_cache.get(id(elements))
+        if cached is None or cached[0] is not elements:
+            cached = _keys_cache[id(elements)] = (elements, tuple(elements.keys()))
+        elements = cached[1]
+    elif not isinstance(elements, (list, tuple, str)):
+        elements = tuple(elements)
+    # The generator's own Random keeps seed_instance() working
+    return self.generator.random.choice(elements)
+
+
+def install():
+    BaseProvider.random_element = _fast_random_element
+
+
+def uninstall():
+    BaseProvider.random_element = _original_random_element
@@ -23,6 +23,24 @@ CREATE TABLE IF NOT EXISTS data_pipeline.raw_savings_plans (
 ) ENGINE = MergeTree()
 ORDER BY (plan_id, updated_at);
 
+-- raw_savings_transactions is sorted by (updated_at, txn_id) so watermark reads
+-- come from the primary index. IF NOT EXISTS leaves tables created with the old
+-- ORDER BY (txn_id, updated_at, txn_timestamp) in place, and a sort key can't be
+-- ALTERed to a new prefix, so migrate existing deployments once, with extraction
+-- paused:
+--
+--   CREATE TABLE data_pipeline.raw_savings_transactions_new
+--       AS data_pipeline.raw_savings_transactions
+--       ENGINE = MergeTree()
+--       PARTITION BY toStartOfMonth(txn_timestamp)
+--       ORDER BY (updated_at, txn_id);
+--   ALTER TABLE data_pipeline.raw_savings_transactions_new
+--       ADD INDEX IF NOT EXISTS idx_txn_id txn_id TYPE bloom_filter GRANULARITY 4;
+--   INSERT INTO data_pipeline.raw_savings_transactions_new
+--       SELECT * FROM data_pipeline.raw_savings_transactions;
+--   EXCHANGE TABLES data_pipeline.raw_savings_transactions
+--       AND data_pipeline.raw_savings_transactions_new;
+--   DROP TABLE data_pipeline.raw_savings_transactions_new;
 CREATE TABLE IF NOT EXISTS data_pipeline.raw_savings_transactions (
     txn_id String,
     plan_id String,
@@ -32,10 +50,11 @@ CREATE TABLE IF NOT EXISTS data_pipeline.raw_savings_transactions (
     rate Float64,
     txn_timestamp DateTime,
     updated_at DateTime,
-    deleted_at Nullable(DateTime)
+    deleted_at Nullable(DateTime),
+    INDEX idx_txn_id txn_id TYPE bloom_filter GRANULARITY 4
 ) ENGINE = MergeTree()
 PARTITION BY toStartOfMonth(txn_timestamp) 
-ORDER BY (txn_id, updated_at, txn_timestamp);
+ORDER BY (updated_at, txn_id);
 
 CREATE TABLE IF NOT EXISTS data_pipeline.raw_users (
     _id String,
@@ -10,6 +10,9 @@ $$;
 
 ALTER ROLE app_user WITH REPLICATION;
 
+-- Row-count table sampling for the CDC simulator's random picks
+CREATE EXTENSION IF NOT EXISTS tsm_system_rows;
+
 CREATE TABLE IF NOT EXISTS savings_plan (
     plan_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     product_type TEXT NOT NULL,
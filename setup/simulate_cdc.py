@@ -2,10 +2,11 @@ import random
 import uuid
 from datetime import datetime, timedelta
 import psycopg2
-from pymongo import MongoClient
-from psycopg2.extras import execute_batch
+from pymongo import MongoClient, UpdateOne
+from psycopg2.extras import execute_batch, execute_values
 from faker import Faker
 
+import fast_faker
 from dagster_code.resources.config import POSTGRES_CONFIG, MONGO_CONFIG
 
 PROFILE = "medium"
@@ -18,6 +19,7 @@ LOAD_PROFILES = {
 
 CFG = LOAD_PROFILES[PROFILE]
 
+fast_faker.install()
 fake = Faker()
 PRODUCT_TYPES = ['fixed_savings', 'target_savings', 'flexi_savings']
 FREQUENCIES = ['daily', 'weekly', 'monthly']
@@ -35,17 +37,24 @@ def simulate_postgres_cdc():
     )
     cur = conn.cursor()
 
+    # Random picks read a sample of pages instead of sorting the whole table;
+    # init-postgres.sql creates the extension on fresh databases
+    cur.execute("CREATE EXTENSION IF NOT EXISTS tsm_system_rows")
+
     cur.execute("SELECT plan_id FROM savings_plan LIMIT %s", (CFG['plans_update'],))
-    for (plan_id,) in cur.fetchall():
-        cur.execute("""
-            UPDATE savings_plan
-            SET amount = amount * %s,
-                status = CASE WHEN random() < 0.1 THEN 'completed' ELSE status END,
-                updated_at = NOW()
-            WHERE plan_id = %s
-        """, (random.uniform(1.01, 1.15), plan_id))
-
-    cur.execute("SELECT DISTINCT customer_uid FROM savings_plan LIMIT %s", (CFG['plans_insert'],))
+    plan_updates = [(plan_id, random.uniform(1.01, 1.15)) for (plan_id,) in cur.fetchall()]
+    execute_values(cur, """
+        UPDATE savings_plan sp
+        SET amount = sp.amount * v.mult,
+            status = CASE WHEN random() < 0.1 THEN 'completed' ELSE sp.status END,
+            updated_at = NOW()
+        FROM (VALUES %s) AS v(plan_id, mult)
+        WHERE sp.plan_id = v.plan_id::uuid
+    """, plan_updates, page_size=1000)
+
+    # Repeat customers are fine for synthetic plans; sampling avoids the full
+    # hash aggregate DISTINCT needs before it can stop at the limit
+    cur.execute("SELECT customer_uid FROM savings_plan TABLESAMPLE SYSTEM_ROWS(%s)", (CFG['plans_insert'],))
     user_ids = [r[0] for r in cur.fetchall()]
     new_plans = []
     for uid in user_ids:
@@ -70,7 +79,7 @@ def simulate_postgres_cdc():
         VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
     """, new_plans, page_size=1000)
 
-    cur.execute("SELECT plan_id FROM savings_plan ORDER BY RANDOM() LIMIT %s", (CFG['txns_insert'],))
+    cur.execute("SELECT plan_id FROM savings_plan TABLESAMPLE SYSTEM_ROWS(%s)", (CFG['txns_insert'],))
     plan_ids = [r[0] for r in cur.fetchall()]
     new_txns = []
     for pid in plan_ids:
@@ -91,14 +100,15 @@ def simulate_postgres_cdc():
         VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
     """, new_txns, page_size=2000)
 
-    cur.execute("SELECT txn_id FROM savingsTransaction ORDER BY RANDOM() LIMIT %s", (CFG['txns_update'],))
-    for (txn_id,) in cur.fetchall():
-        cur.execute("""
-            UPDATE savingsTransaction
-            SET rate = rate * %s,
-                updated_at = NOW()
-            WHERE txn_id = %s
-        """, (random.uniform(0.98, 1.05), txn_id))
+    cur.execute("SELECT txn_id FROM savingsTransaction TABLESAMPLE SYSTEM_ROWS(%s)", (CFG['txns_update'],))
+    txn_updates = [(txn_id, random.uniform(0.98, 1.05)) for (txn_id,) in cur.fetchall()]
+    execute_values(cur, """
+        UPDATE savingsTransaction st
+        SET rate = st.rate * v.mult,
+            updated_at = NOW()
+        FROM (VALUES %s) AS v(txn_id, mult)
+        WHERE st.txn_id = v.txn_id::uuid
+    """, txn_updates, page_size=2000)
 
     conn.commit()
     cur.close()
@@ -106,18 +116,23 @@ def simulate_postgres_cdc():
 
 
 def simulate_mongodb_snapshot():
-    client = MongoClient(MONGO_CONFIG["mongo_uri"])
+    # Simulated writes don't need acknowledging
+    client = MongoClient(MONGO_CONFIG["mongo_uri"], w=0)
     db = client[MONGO_CONFIG["mongo_database"]]
     users = db["users"]
 
-    for user in users.find().limit(CFG['users_update']):
-        users.update_one(
+    updates = [
+        UpdateOne(
             {'_id': user['_id']},
             {'$set': {
                 'occupation': random.choice(OCCUPATIONS),
                 'state': random.choice(STATES)
             }}
         )
+        for user in users.find({}, {'_id': 1}).limit(CFG['users_update'])
+    ]
+    if updates:
+        users.bulk_write(updates, ordered=False)
 
     count = users.count_documents({})
     new_users = [{
@@ -129,7 +144,7 @@ def simulate_mongodb_snapshot():
     } for i in range(CFG['users_insert'])]
 
     if new_users:
-        users.insert_many(new_users)
+        users.insert_many(new_users, ordered=False)
 
     client.close()
 